@@ -1,49 +1,201 @@
 import asyncio
+import heapq
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler
 import json
 import os
+import sqlite3
 
 # Global state for betting
 active_bets = {}  # {token_key: {"price": float, "bets": {"user_id": "higher/lower"}}}
 user_stats = {}   # {user_id: {"daily_points": int, "total_bets": int, "correct_bets": int}}
 last_transaction_prices = {}  # {token_key: float}
 
-# File paths for persistence
+# SQLite persistence (WAL mode) - each save touches only the changed rows
+# instead of rewriting the whole dataset like the old JSON files did
+DB_FILE = "betting.db"
+
+# Legacy JSON files, imported into the database on first run
 STATS_FILE = "user_stats.json"
 BETS_FILE = "active_bets.json"
 
+_db = sqlite3.connect(DB_FILE, isolation_level=None)
+_db.execute("PRAGMA journal_mode=WAL")
+_db.execute(
+    "CREATE TABLE IF NOT EXISTS user_stats ("
+    "user_id TEXT PRIMARY KEY, daily_points INT, total_bets INT, "
+    "correct_bets INT, last_reset_date TEXT, username TEXT)"
+)
+_db.execute(
+    "CREATE TABLE IF NOT EXISTS active_bets ("
+    "token_key TEXT, user_id TEXT, choice TEXT, display_name TEXT, "
+    "price REAL, chat_id INT, PRIMARY KEY(token_key, user_id))"
+)
+
+# Dirty tracking so a burst of bets coalesces into one small write
+_dirty_user_ids = set()
+_bets_dirty = False
+_flush_task = None
+
+def _mark_stats_dirty(user_id):
+    """Flag a user's stats row as needing a database write"""
+    _dirty_user_ids.add(str(user_id))
+
+def _mark_bets_dirty():
+    """Flag active bets as needing a database write"""
+    global _bets_dirty
+    _bets_dirty = True
+
+def _migrate_legacy_json():
+    """One-time import of the old JSON files into the database"""
+    if _db.execute("SELECT COUNT(*) FROM user_stats").fetchone()[0] > 0:
+        return
+    if not os.path.exists(STATS_FILE):
+        return
+
+    try:
+        with open(STATS_FILE, 'r') as f:
+            legacy_stats = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Could not read legacy stats file: {e}")
+        legacy_stats = {}
+
+    for user_id, stats in legacy_stats.items():
+        _db.execute(
+            "INSERT OR REPLACE INTO user_stats VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                user_id,
+                stats.get("daily_points", 0),
+                stats.get("total_bets", 0),
+                stats.get("correct_bets", 0),
+                stats.get("last_reset_date", ""),
+                stats.get("username")
+            )
+        )
+
+    print(f"✅ Migrated {len(legacy_stats)} users from {STATS_FILE} to {DB_FILE}")
+
 def load_data():
-    """Load user stats and active bets from files"""
+    """Load user stats and active bets from the database"""
     global user_stats, active_bets
-    
+
+    # Flush anything still waiting on the debounced save first - otherwise
+    # the reload replaces the in-memory dicts with an older snapshot and
+    # the still-set dirty flags would then persist that rollback
+    save_data()
+
+    _migrate_legacy_json()
+
     # Load user stats
-    if os.path.exists(STATS_FILE):
-        try:
-            with open(STATS_FILE, 'r') as f:
-                user_stats = json.load(f)
-        except:
-            user_stats = {}
-    
+    user_stats = {}
+    for user_id, daily_points, total_bets, correct_bets, last_reset_date, username in _db.execute(
+        "SELECT user_id, daily_points, total_bets, correct_bets, last_reset_date, username FROM user_stats"
+    ):
+        user_stats[user_id] = {
+            "daily_points": daily_points,
+            "total_bets": total_bets,
+            "correct_bets": correct_bets,
+            "last_reset_date": last_reset_date,
+            "username": username
+        }
+
     # Load active bets
-    if os.path.exists(BETS_FILE):
-        try:
-            with open(BETS_FILE, 'r') as f:
-                active_bets = json.load(f)
-        except:
-            active_bets = {}
+    active_bets = {}
+    for token_key, user_id, choice, display_name, price, chat_id in _db.execute(
+        "SELECT token_key, user_id, choice, display_name, price, chat_id FROM active_bets"
+    ):
+        betting_round = active_bets.setdefault(token_key, {
+            "price": price,
+            "bets": {},
+            "chat_id": chat_id,
+            "message_id": None
+        })
+        betting_round["bets"][user_id] = {
+            "choice": choice,
+            "display_name": display_name
+        }
 
 def save_data():
-    """Save user stats and active bets to files"""
-    # Save user stats
-    with open(STATS_FILE, 'w') as f:
-        json.dump(user_stats, f)
-    
-    # Save active bets
-    with open(BETS_FILE, 'w') as f:
-        json.dump(active_bets, f)
+    """Save any changed user stats and active bets to the database"""
+    global _bets_dirty
+
+    if not _dirty_user_ids and not _bets_dirty:
+        return
+
+    _db.execute("BEGIN IMMEDIATE")
+    try:
+        # Upsert only the users that actually changed
+        for user_id in _dirty_user_ids:
+            stats = user_stats.get(user_id)
+            if stats is None:
+                continue
+            _db.execute(
+                "INSERT INTO user_stats VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET "
+                "daily_points=excluded.daily_points, total_bets=excluded.total_bets, "
+                "correct_bets=excluded.correct_bets, last_reset_date=excluded.last_reset_date, "
+                "username=excluded.username",
+                (
+                    user_id,
+                    stats.get("daily_points", 0),
+                    stats.get("total_bets", 0),
+                    stats.get("correct_bets", 0),
+                    stats.get("last_reset_date", ""),
+                    stats.get("username")
+                )
+            )
+        _dirty_user_ids.clear()
+
+        # Active bets are tiny, so just rewrite them when dirty
+        if _bets_dirty:
+            _db.execute("DELETE FROM active_bets")
+            for token_key, betting_round in active_bets.items():
+                for user_id, bet_info in betting_round["bets"].items():
+                    _db.execute(
+                        "INSERT INTO active_bets VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            token_key,
+                            user_id,
+                            bet_info["choice"],
+                            bet_info["display_name"],
+                            betting_round["price"],
+                            betting_round.get("chat_id")
+                        )
+                    )
+            _bets_dirty = False
+
+        _db.execute("COMMIT")
+    except Exception as e:
+        _db.execute("ROLLBACK")
+        print(f"❌ Error saving betting data: {e}")
+
+async def _flush_loop():
+    """Wait briefly then flush, so rapid bets become one disk write"""
+    global _flush_task
+    try:
+        await asyncio.sleep(0.5)
+        save_data()
+    finally:
+        _flush_task = None
+
+def schedule_save():
+    """Schedule a debounced save; falls back to an immediate write outside a loop"""
+    global _flush_task
+
+    if _flush_task is not None:
+        return  # A flush is already pending
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop running (e.g. scripts) - write immediately
+        save_data()
+        return
+
+    _flush_task = loop.create_task(_flush_loop())
 
 def get_user_display_name(user) -> str:
     """Get user's display name for messages"""
@@ -64,26 +216,48 @@ def create_betting_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+# Cache the formatted date for one second - it is recomputed on every bet and
+# leaderboard view, and a 1s TTL keeps the midnight rollover exact enough
+_date_cache = (0.0, "")
+
 def get_current_gmt_date() -> str:
     """Get current date in GMT timezone"""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    global _date_cache
+
+    now = time.monotonic()
+    cached_at, cached_date = _date_cache
+    if cached_date and now - cached_at < 1.0:
+        return cached_date
+
+    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    _date_cache = (now, date_str)
+    return date_str
+
+# Date of the last daily reset, so repeat calls can skip the full user walk
+_last_global_reset = ""
 
 def reset_daily_stats():
     """Reset daily stats for all users"""
-    global user_stats
+    global _last_global_reset
     current_date = get_current_gmt_date()
-    
+
+    # Already reset today - nothing to do
+    if current_date == _last_global_reset:
+        return
+    _last_global_reset = current_date
+
     for user_id in user_stats:
         if "last_reset_date" not in user_stats[user_id]:
             user_stats[user_id]["last_reset_date"] = current_date
             user_stats[user_id]["daily_points"] = 0
+            _mark_stats_dirty(user_id)
         elif user_stats[user_id]["last_reset_date"] != current_date:
             user_stats[user_id]["last_reset_date"] = current_date
             user_stats[user_id]["daily_points"] = 0
+            _mark_stats_dirty(user_id)
 
 def award_points_to_user(user_id: str, points: int = 1, username: str = None):
     """Award points to a user"""
-    global user_stats
     
     user_id_str = str(user_id)
     if user_id_str not in user_stats:
@@ -100,10 +274,10 @@ def award_points_to_user(user_id: str, points: int = 1, username: str = None):
     user_stats[user_id_str]["daily_points"] += points
     user_stats[user_id_str]["correct_bets"] += 1
     user_stats[user_id_str]["total_bets"] += 1
+    _mark_stats_dirty(user_id_str)
 
 def record_bet_for_user(user_id: str, username: str = None):
     """Record that a user placed a bet (for total_bets tracking)"""
-    global user_stats
     
     user_id_str = str(user_id)
     if user_id_str not in user_stats:
@@ -118,10 +292,10 @@ def record_bet_for_user(user_id: str, username: str = None):
         user_stats[user_id_str]["username"] = username
     
     user_stats[user_id_str]["total_bets"] += 1
+    _mark_stats_dirty(user_id_str)
 
 def start_new_betting_round(token_key: str, price: float, chat_id: int, bot):
     """Start a new betting round for a token"""
-    global active_bets, last_transaction_prices
     
     # Store the current price
     last_transaction_prices[token_key] = price
@@ -147,7 +321,6 @@ def start_new_betting_round(token_key: str, price: float, chat_id: int, bot):
 
 def place_bet(token_key: str, user_id: int, choice: str, user) -> Tuple[bool, str]:
     """Place a bet for a user"""
-    global active_bets
     
     if token_key not in active_bets:
         return False, "No active betting round for this token."
@@ -166,9 +339,10 @@ def place_bet(token_key: str, user_id: int, choice: str, user) -> Tuple[bool, st
         "display_name": user_display_name
     }
     record_bet_for_user(user_id, user_display_name)
-    
+
     # Save data
-    save_data()
+    _mark_bets_dirty()
+    schedule_save()
     
     choice_emoji = "🟢" if choice == "higher" else "🔴"
     choice_text = "HIGHER" if choice == "higher" else "LOWER"
@@ -177,7 +351,6 @@ def place_bet(token_key: str, user_id: int, choice: str, user) -> Tuple[bool, st
 
 def resolve_betting_round(token_key: str, new_price: float, bot) -> Optional[str]:
     """Resolve the current betting round and return result message"""
-    global active_bets, last_transaction_prices
     
     if token_key not in active_bets:
         return None
@@ -210,80 +383,121 @@ def resolve_betting_round(token_key: str, new_price: float, bot) -> Optional[str
         else:
             losers.append(display_name)
     
-    # Create result message
-    result_message = (
+    # Create result message - build in a list and join once instead of
+    # repeated string concatenation
+    parts = [
         f"🏆 **BETTING RESULTS** 🏆\n\n"
         f"Previous Price: **${old_price:,.4f}**\n"
         f"New Price: **${new_price:,.4f}** {price_direction}\n\n"
-    )
-    
+    ]
+
     if winning_choice == "same":
-        result_message += "💰 **PRICE UNCHANGED** - No winners or losers!\n\n"
+        parts.append("💰 **PRICE UNCHANGED** - No winners or losers!\n\n")
     else:
         if winners:
-            result_message += f"✅ **WINNERS** ({winning_choice.upper()} bettors):\n"
+            parts.append(f"✅ **WINNERS** ({winning_choice.upper()} bettors):\n")
             for display_name in winners:
-                result_message += f"• {display_name}\n"
-            result_message += "\n"
-        
+                parts.append(f"• {display_name}\n")
+            parts.append("\n")
+
         if losers:
-            result_message += f"❌ **LOSERS** ({'lower' if winning_choice == 'higher' else 'higher'} bettors):\n"
+            parts.append(f"❌ **LOSERS** ({'lower' if winning_choice == 'higher' else 'higher'} bettors):\n")
             for display_name in losers:
-                result_message += f"• {display_name}\n"
-            result_message += "\n"
-        
+                parts.append(f"• {display_name}\n")
+            parts.append("\n")
+
         if winners:
-            result_message += "🎉 Points awarded to winners!"
-    
+            parts.append("🎉 Points awarded to winners!")
+
+    result_message = "".join(parts)
+
     # Clear the betting round
     del active_bets[token_key]
-    save_data()
+    _mark_bets_dirty()
+    schedule_save()
     
     return result_message
 
+# Medal emojis indexed by rank - a plain indexed load instead of a branch
+# chain inside the top-10 loop
+_RANK_EMOJI = ("🥇", "🥈", "🥉", "🏆", "🏆", "🏆", "🏆", "🏆", "🏆", "🏆")
+
 def get_daily_leaderboard(bot=None) -> str:
     """Get the current daily leaderboard"""
     reset_daily_stats()
-    
-    # Sort users by daily points (descending)
-    sorted_users = sorted(
+
+    if not user_stats:
+        return "📊 **DAILY LEADERBOARD** 📊\n\nNo bets placed today!"
+
+    # Pick the top 10 by daily points - O(N log 10) instead of a full sort
+    top_users = heapq.nlargest(
+        10,
         user_stats.items(),
-        key=lambda x: x[1]["daily_points"],
-        reverse=True
+        key=lambda x: x[1]["daily_points"]
     )
-    
-    if not sorted_users:
-        return "📊 **DAILY LEADERBOARD** 📊\n\nNo bets placed today!"
-    
-    leaderboard = "📊 **DAILY LEADERBOARD** 📊\n\n"
-    
-    for i, (user_id, stats) in enumerate(sorted_users[:10], 1):  # Top 10
+
+    lines = ["📊 **DAILY LEADERBOARD** 📊\n\n"]
+
+    for i, (user_id, stats) in enumerate(top_users, 1):
         if stats["daily_points"] > 0:
-            emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else "🏆"
+            emoji = _RANK_EMOJI[i - 1]
             accuracy = (stats["correct_bets"] / stats["total_bets"] * 100) if stats["total_bets"] > 0 else 0
-            
-            # Try to get username from stored data first
-            username = stats.get("username", None)
-            
-            # If no username stored, try to get it from active bets
-            if not username:
-                for token_key, bet_data in active_bets.items():
-                    if user_id in bet_data["bets"]:
-                        username = bet_data["bets"][user_id]["display_name"]
-                        # Update the stored data with the username
-                        user_stats[user_id]["username"] = username
-                        save_data()
-                        break
-            
-            # If still no username, use user ID
-            if not username:
-                username = f"User {user_id}"
-            
-            leaderboard += f"{emoji} {username}: {stats['daily_points']} point{'s' if stats['daily_points'] != 1 else ''}\n({stats['correct_bets']}/{stats['total_bets']} correct, {accuracy:.1f}%)\n\n"
-    
-    leaderboard += "\n📅 Daily stats reset at midnight GMT!"
-    
-    return leaderboard
+
+            # Username is stored when the bet is placed; fall back to user ID
+            username = stats.get("username") or f"User {user_id}"
+
+            lines.append(f"{emoji} {username}: {stats['daily_points']} point{'s' if stats['daily_points'] != 1 else ''}\n({stats['correct_bets']}/{stats['total_bets']} correct, {accuracy:.1f}%)\n\n")
+
+    lines.append("\n📅 Daily stats reset at midnight GMT!")
+
+    return "".join(lines)
+
+# Group chats that get the end-of-day leaderboard post. One scheduler task
+# serves every chat, so there is a single wakeup per day no matter how many
+# groups the bot is in.
+_leaderboard_chats = set()
+_scheduler_task = None
+
+def register_daily_chat(chat_id: int):
+    """Register a group chat for the end-of-day leaderboard post"""
+    _leaderboard_chats.add(chat_id)
+
+def _seconds_until_daily_post() -> float:
+    """Seconds until 23:59:30 GMT, just before the midnight stats reset"""
+    now = datetime.now(timezone.utc)
+    target = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(seconds=30)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+async def _post_daily_leaderboard(bot, chat_id: int, leaderboard: str):
+    """Post the leaderboard to one chat, swallowing per-chat send errors"""
+    try:
+        await bot.send_message(chat_id=chat_id, text=leaderboard, parse_mode='Markdown')
+    except Exception as e:
+        print(f"❌ Error posting daily leaderboard to chat {chat_id}: {e}")
+
+async def daily_leaderboard_scheduler(bot):
+    """Post the final daily standings to every registered chat once per day"""
+    while True:
+        await asyncio.sleep(_seconds_until_daily_post())
+
+        if _leaderboard_chats:
+            leaderboard = get_daily_leaderboard(bot)
+            await asyncio.gather(*(
+                _post_daily_leaderboard(bot, chat_id, leaderboard)
+                for chat_id in _leaderboard_chats
+            ))
+
+        # Roll past midnight so the next sleep targets tomorrow's post
+        await asyncio.sleep(60)
+
+def ensure_daily_scheduler(bot):
+    """Start the single daily scheduler task if it isn't running yet"""
+    global _scheduler_task
+
+    if _scheduler_task is None or _scheduler_task.done():
+        _scheduler_task = asyncio.get_running_loop().create_task(daily_leaderboard_scheduler(bot))
 
 def get_user_stats(user_id: int, user_display_name: str = None) -> str:
     """Get stats for a specific user"""
@@ -1,14 +1,19 @@
 import asyncio
-import requests
-from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, CallbackQueryHandler
+import os
+import re
+import time
+from io import BytesIO
+import aiohttp
+from telegram.constants import ChatAction
+from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, CallbackQueryHandler, Defaults
 from web3 import Web3
 
 # Import our modular components
 from config import TOKEN, TARGET_PRICE, IMAGE_PATH, validate_config, get_token_config, get_all_token_keys
-from price_utils import get_emp_price_from_pool, get_btc_price_from_eth, get_return, format_percentage, eth_usd
-from transaction_utils import get_last_5_transactions, format_last_5_transactions
+from price_utils import get_emp_price_from_pool, get_btc_price_from_eth, get_return, format_percentage, eth_usd, _json_loads
+from transaction_utils import get_last_5_transactions, format_last_5_transactions, short_address
 from monitoring import monitor_transactions, monitoring_groups, monitoring_tasks, get_w3_connection, get_monitoring_status
-from betting_system import place_bet, get_daily_leaderboard, get_user_stats
+from betting_system import place_bet, get_daily_leaderboard, get_user_stats, register_daily_chat, ensure_daily_scheduler
 
 # Initialize Web3 connections
 w3_connections = {}
@@ -18,32 +23,229 @@ if INFURA_URL:
 if ARBITRUM_RPC_URL:
     w3_connections["arbitrum"] = Web3(Web3.HTTPProvider(ARBITRUM_RPC_URL))
 
+# Logo image cache - the bytes are preloaded once at startup, and after the
+# first upload Telegram's file_id is reused so the image is never re-uploaded
+try:
+    with open(IMAGE_PATH, "rb") as f:
+        _logo_bytes = f.read()
+except OSError as e:
+    print(f"⚠️ Could not preload logo image: {e}")
+    _logo_bytes = None
+
+# The file_id survives restarts via a sidecar file, so the logo is only
+# ever uploaded once per image, not once per process
+_LOGO_FILE_ID_FILE = ".billi_file_id"
+_logo_file_id = None
+try:
+    with open(_LOGO_FILE_ID_FILE, "r") as f:
+        _logo_file_id = f.read().strip() or None
+except OSError:
+    pass
+
+def _get_logo_bytes() -> bytes:
+    global _logo_bytes
+    if _logo_bytes is None:
+        with open(IMAGE_PATH, "rb") as f:
+            _logo_bytes = f.read()
+    return _logo_bytes
+
+async def send_logo_photo(bot, chat_id: int, caption: str):
+    """Send the logo, reusing Telegram's cached file_id after the first upload"""
+    global _logo_file_id
+
+    if _logo_file_id:
+        try:
+            await bot.send_photo(chat_id=chat_id, photo=_logo_file_id, caption=caption)
+            return
+        except Exception as e:
+            print(f"⚠️ Cached logo file_id failed ({e}), re-uploading...")
+            _logo_file_id = None
+
+    msg = await bot.send_photo(chat_id=chat_id, photo=BytesIO(_get_logo_bytes()), caption=caption)
+    if msg.photo:
+        _logo_file_id = msg.photo[-1].file_id
+        try:
+            with open(_LOGO_FILE_ID_FILE, "w") as f:
+                f.write(_logo_file_id)
+        except OSError as e:
+            print(f"⚠️ Could not persist logo file_id: {e}")
+
+# Cache CoinGecko market responses briefly so bursts of commands share one
+# API call instead of tripping CoinGecko's rate limit
+COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
+_market_cache = {}  # {frozenset(ids): (timestamp, data)}
+_market_etags = {}  # {frozenset(ids): etag} for conditional revalidation
+MARKET_CACHE_TTL = 30  # seconds
+
+# Shared aiohttp session for CoinGecko calls - created lazily on the running
+# event loop so the request is awaited directly instead of blocking a thread
+_http_session = None
+
+# Circuit breaker: after a 429 every fetch short-circuits to the cache
+# until this deadline instead of burning more of the rate-limit window
+_rate_limited_until = 0.0
+
+def _get_http_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        )
+    return _http_session
+
+async def _close_http_session(app):
+    """post_shutdown hook - stop the refresher and close the aiohttp session"""
+    if _price_refresher_task and not _price_refresher_task.done():
+        _price_refresher_task.cancel()
+    if _http_session and not _http_session.closed:
+        await _http_session.close()
+
+async def fetch_markets(ids: str):
+    """
+    Fetch /coins/markets rows from CoinGecko for comma-separated coin ids
+
+    Returns:
+        Tuple of (status_code, data) - data is None unless status is 200
+    """
+    global _rate_limited_until
+
+    cache_key = frozenset(ids.split(","))
+    cached = _market_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < MARKET_CACHE_TTL:
+        return 200, cached[1]
+
+    # While rate-limited, don't add fuel to the fire - serve stale data if
+    # there is any rather than sending a request that will be 429'd anyway
+    if time.monotonic() < _rate_limited_until:
+        if cached:
+            return 200, cached[1]
+        return 429, None
+
+    params = {
+        "vs_currency": "usd",
+        "ids": ids,
+        "order": "market_cap_desc",
+        "per_page": "10",
+        "page": "1",
+        "sparkline": "false"
+    }
+
+    # Revalidate with the stored ETag once the TTL lapses - a 304 costs a
+    # handful of header bytes instead of the full payload
+    headers = {}
+    etag = _market_etags.get(cache_key)
+    if etag and cached:
+        headers["If-None-Match"] = etag
+
+    session = _get_http_session()
+    async with session.get(COINGECKO_MARKETS_URL, params=params, headers=headers,
+                           timeout=aiohttp.ClientTimeout(total=10)) as response:
+        if response.status == 304 and cached:
+            _market_cache[cache_key] = (time.monotonic(), cached[1])
+            return 200, cached[1]
+        if response.status == 429:
+            try:
+                wait = float(response.headers.get("Retry-After", 60))
+            except ValueError:
+                wait = 60.0
+            _rate_limited_until = time.monotonic() + wait
+            print(f"⚠️ CoinGecko rate limited, backing off for {wait:.0f}s")
+            if cached:
+                return 200, cached[1]
+            return 429, None
+        if response.status != 200:
+            return response.status, None
+        data = _json_loads(await response.read())
+        new_etag = response.headers.get("ETag")
+        if new_etag:
+            _market_etags[cache_key] = new_etag
+
+    if data:
+        _market_cache[cache_key] = (time.monotonic(), data)
+    return 200, data
+
+# All coins the price commands care about, fetched as one batch so every
+# handler shares a single cache entry (and a single upstream request)
+TRACKED_IDS = "bitcoin,ethereum,empyreal"
+
+# Refresh just inside the cache TTL so price commands always hit a warm
+# cache and upstream traffic stays fixed at ~2-3 calls/minute regardless
+# of how busy the group is
+PRICE_REFRESH_INTERVAL = 25  # seconds
+_price_refresher_task = None
+
+async def _price_refresher():
+    """Keep the TRACKED_IDS market bundle warm in the background"""
+    while True:
+        try:
+            await fetch_markets(TRACKED_IDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Background price refresh failed: {e}")
+        await asyncio.sleep(PRICE_REFRESH_INTERVAL)
+
+async def _start_price_refresher(app):
+    """post_init hook - start the background market refresher"""
+    global _price_refresher_task
+    _price_refresher_task = asyncio.create_task(_price_refresher())
+    print("🔄 Background price refresher started")
+
+async def get_market_price(coin_id: str):
+    """Current USD price for one coin from the batched market fetch, or None"""
+    try:
+        status_code, data = await fetch_markets(TRACKED_IDS)
+        if status_code == 200 and data:
+            for coin in data:
+                if coin["id"] == coin_id:
+                    return coin["current_price"]
+    except Exception as e:
+        print(f"⚠️ Batched market fetch failed for {coin_id}: {e}")
+    return None
+
 # ============================================================================
 # COMMAND HANDLERS
 # ============================================================================
 
+# Caption templates built once at import - the constant target price and
+# static lines are baked in, leaving only the dynamic fields to format
+_PRICE_CAPTION = (
+    "$EMP Price Update:\n\n"
+    "🐻 bearish at ${price:.2f}\n"
+    f"💰 price next week: ${TARGET_PRICE:,}\n"
+    "📈 predicted return: {ret}%\n"
+    "👨 performance secured by Jpow\n\n"
+    "(financial advice)"
+)
+
+_DETAILED_PRICE_CAPTION = (
+    "$EMP price update:\n\n"
+    "💸 bearish at: ${price:.2f}\n"
+    f"🎯 next week price: ${TARGET_PRICE:,}\n"
+    "📈 guaranteed return: {ret}%\n\n"
+    "📊 Price from Uniswap V3 Pool\n"
+    "📍 Pool: 0xe092769bc1fa5262D4f48353f90890Dcc339BF80\n"
+)
+
 async def send_price(update, context):
     """Send EMP price with target and return prediction"""
     print(f"💰 Command called: /billi by user {update.effective_user.id} in chat {update.effective_chat.id}")
     try:
-        price = get_emp_price_from_pool()
+        # Show the upload indicator immediately so the command feels instant
+        # even when the upstream price APIs are slow
+        await context.bot.send_chat_action(chat_id=update.effective_chat.id, action=ChatAction.UPLOAD_PHOTO)
+
+        # Run the blocking HTTP fetch in a worker thread so the event loop stays free
+        price = await asyncio.to_thread(get_emp_price_from_pool)
         if price is None:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch EMP price from pool.")
             return
         
         ret = get_return(price, TARGET_PRICE)
 
-        text = (
-            f"$EMP Price Update:\n\n"
-            f"🐻 bearish at ${price:.2f}\n"
-            f"💰 price next week: ${TARGET_PRICE:,}\n"
-            f"📈 predicted return: {format_percentage(ret)}%\n"
-            f"👨 performance secured by Jpow\n\n"
-            f"(financial advice)"
-        )
+        text = _PRICE_CAPTION.format(price=price, ret=format_percentage(ret))
 
-        with open(IMAGE_PATH, "rb") as img:
-            await context.bot.send_photo(chat_id=update.effective_chat.id, photo=img, caption=text)
+        await send_logo_photo(context.bot, update.effective_chat.id, text)
     except Exception as e:
         await context.bot.send_message(chat_id=update.effective_chat.id, text="Error fetching price data.")
         return
@@ -52,21 +254,14 @@ async def send_detailed_price(update, context):
     """Send detailed EMP price information"""
     print(f"📊 Command called: /price by user {update.effective_user.id} in chat {update.effective_chat.id}")
     try:
-        price = get_emp_price_from_pool()
+        price = await asyncio.to_thread(get_emp_price_from_pool)
         if price is None:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch EMP price from pool.")
             return
         
         ret = get_return(price, TARGET_PRICE)
 
-        text = (
-            f"$EMP price update:\n\n"
-            f"💸 bearish at: ${price:.2f}\n"
-            f"🎯 next week price: ${TARGET_PRICE:,}\n"
-            f"📈 guaranteed return: {format_percentage(ret)}%\n\n"
-            f"📊 Price from Uniswap V3 Pool\n"
-            f"📍 Pool: 0xe092769bc1fa5262D4f48353f90890Dcc339BF80\n"
-        )
+        text = _DETAILED_PRICE_CAPTION.format(price=price, ret=format_percentage(ret))
 
         await context.bot.send_message(chat_id=update.effective_chat.id, text=text)
     except Exception as e:
@@ -77,7 +272,10 @@ async def send_emp_price(update, context):
     """Send simple EMP price"""
     print(f"💎 Command called: /empprice by user {update.effective_user.id} in chat {update.effective_chat.id}")
     try:
-        price = get_emp_price_from_pool()
+        # Shared batched fetch first; fall back to the pool calculation
+        price = await get_market_price("empyreal")
+        if price is None:
+            price = await asyncio.to_thread(get_emp_price_from_pool)
         if price is None:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch EMP price from pool.")
             return
@@ -93,7 +291,10 @@ async def send_btc_price(update, context):
     """Send BTC price"""
     print(f"₿ Command called: /btcprice by user {update.effective_user.id} in chat {update.effective_chat.id}")
     try:
-        price = get_btc_price_from_eth()
+        # Shared batched fetch first; fall back to the ETH-ratio derivation
+        price = await get_market_price("bitcoin")
+        if price is None:
+            price = await asyncio.to_thread(get_btc_price_from_eth)
         if price is None:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch BTC price from ETH data.")
             return
@@ -109,7 +310,10 @@ async def send_eth_price(update, context):
     """Send ETH price"""
     print(f"Ξ Command called: /ethprice by user {update.effective_user.id} in chat {update.effective_chat.id}")
     try:
-        price = eth_usd()
+        # Shared batched fetch first; fall back to the Etherscan lookup
+        price = await get_market_price("ethereum")
+        if price is None:
+            price = await asyncio.to_thread(eth_usd)
         if price is None:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch ETH price from Etherscan.")
             return
@@ -125,55 +329,31 @@ async def send_performance_comparison(update, context):
     """Get 24-hour performance data for ETH, BTC, and EMP with relative comparisons"""
     print(f"📈 Command called: /performance by user {update.effective_user.id} in chat {update.effective_chat.id}")
     
-    # Get data for all three assets from CoinGecko
-    url = "https://api.coingecko.com/api/v3/coins/markets"
-    params = {
-        "vs_currency": "usd",
-        "ids": "ethereum,bitcoin,empyreal",
-        "order": "market_cap_desc",
-        "per_page": "10",
-        "page": "1",
-        "sparkline": "false"
-    }
-    
     try:
-        response = requests.get(url, params=params)
-        if response.status_code == 429:
+        # Get data for all three assets from CoinGecko
+        status_code, data = await fetch_markets(TRACKED_IDS)
+        if status_code == 429:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Rate limit exceeded. Please try again in a minute.")
             return
-            
-        data = response.json()
+
         if not data or len(data) < 3:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch market data. Please try again.")
             return
         
-        # Organize data by coin
-        coin_data = {}
-        
-        # Process CoinGecko data for ETH, BTC, and EMP
-        for coin in data:
-            if coin["id"] == "ethereum":
-                coin_data["ethereum"] = {
-                    "price": coin["current_price"],
-                    "change_24h": coin["price_change_percentage_24h"],
-                    "price_change_24h": coin["price_change_24h"]
-                }
-            elif coin["id"] == "bitcoin":
-                coin_data["bitcoin"] = {
-                    "price": coin["current_price"],
-                    "change_24h": coin["price_change_percentage_24h"],
-                    "price_change_24h": coin["price_change_24h"]
-                }
-            elif coin["id"] == "empyreal":
-                coin_data["empyreal"] = {
-                    "price": coin["current_price"],
-                    "change_24h": coin["price_change_percentage_24h"],
-                    "price_change_24h": coin["price_change_24h"]
-                }
+        # Organize data by coin - single pass over the CoinGecko rows
+        coin_data = {
+            coin["id"]: {
+                "price": coin["current_price"],
+                "change_24h": coin["price_change_percentage_24h"],
+                "price_change_24h": coin["price_change_24h"]
+            }
+            for coin in data
+            if coin["id"] in ("bitcoin", "ethereum", "empyreal")
+        }
         
         # If EMP data not available from CoinGecko, fallback to pool price
         if "empyreal" not in coin_data:
-            emp_price = get_emp_price_from_pool()
+            emp_price = await asyncio.to_thread(get_emp_price_from_pool)
             if emp_price is None:
                 await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not fetch EMP price from pool.")
                 return
@@ -188,20 +368,18 @@ async def send_performance_comparison(update, context):
         await context.bot.send_message(chat_id=update.effective_chat.id, text="Error fetching market data. Please try again.")
         return
     
-    # Format the data
-    def format_percent(value):
-        return f"{value:+.2f}%" if value >= 0 else f"{value:.2f}%"
-    
     # Calculate relative performance
     eth_change = coin_data["ethereum"]["change_24h"]
     btc_change = coin_data["bitcoin"]["change_24h"]
     emp_change = coin_data["empyreal"]["change_24h"]
-    
+
     # Relative performance calculations
     emp_vs_btc = emp_change - btc_change
     emp_vs_eth = emp_change - eth_change
     eth_vs_btc = eth_change - btc_change
-    
+
+    # The :+.2f spec already renders the sign for both directions, so the
+    # percentages format inline without a per-call helper closure
     text = (
         f"📊 **24-Hour Performance Report** 📊\n\n"
         f"💰 **Current Prices:**\n"
@@ -209,33 +387,34 @@ async def send_performance_comparison(update, context):
         f"Ξ Ethereum: ${coin_data['ethereum']['price']:,.2f}\n"
         f"💎 EMP: ${coin_data['empyreal']['price']:,.2f}\n\n"
         f"📈 **24h Change:**\n"
-        f"₿ Bitcoin: {format_percent(btc_change)}\n"
-        f"Ξ Ethereum: {format_percent(eth_change)}\n"
-        f"💎 EMP: {format_percent(emp_change)}\n\n"
+        f"₿ Bitcoin: {btc_change:+.2f}%\n"
+        f"Ξ Ethereum: {eth_change:+.2f}%\n"
+        f"💎 EMP: {emp_change:+.2f}%\n\n"
         f"📊 **Relative Performance:**\n"
-        f"💎 EMP vs ₿ BTC: {format_percent(emp_vs_btc)}\n"
-        f"💎 EMP vs Ξ ETH: {format_percent(emp_vs_eth)}\n"
-        f"Ξ ETH vs ₿ BTC: {format_percent(eth_vs_btc)}"
+        f"💎 EMP vs ₿ BTC: {emp_vs_btc:+.2f}%\n"
+        f"💎 EMP vs Ξ ETH: {emp_vs_eth:+.2f}%\n"
+        f"Ξ ETH vs ₿ BTC: {eth_vs_btc:+.2f}%"
     )
     
     await context.bot.send_message(chat_id=update.effective_chat.id, text=text, parse_mode='Markdown')
 
+# The /vol response has no dynamic fields - build it once at import
+_VOLUME_TEXT = (
+    "💎 **$EMP Volume Information:**\n\n"
+    "📊 Volume data is not available from the Uniswap V3 pool.\n"
+    "📍 Pool: 0xe092769bc1fa5262D4f48353f90890Dcc339BF80\n\n"
+    "ℹ️ To get volume data, you would need to:\n"
+    "• Query historical swap events\n"
+    "• Calculate volume from transaction data\n"
+    "• Use a different API service\n\n"
+    "💡 Current price is available via /emp command"
+)
+
 async def send_daily_volume(update, context):
     """Command to show daily trading volume for EMP"""
     print(f"📊 Command called: /vol by user {update.effective_user.id} in chat {update.effective_chat.id}")
-    
-    text = (
-        f"💎 **$EMP Volume Information:**\n\n"
-        f"📊 Volume data is not available from the Uniswap V3 pool.\n"
-        f"📍 Pool: 0xe092769bc1fa5262D4f48353f90890Dcc339BF80\n\n"
-        f"ℹ️ To get volume data, you would need to:\n"
-        f"• Query historical swap events\n"
-        f"• Calculate volume from transaction data\n"
-        f"• Use a different API service\n\n"
-        f"💡 Current price is available via /emp command"
-    )
-    
-    await context.bot.send_message(chat_id=update.effective_chat.id, text=text, parse_mode='Markdown')
+
+    await context.bot.send_message(chat_id=update.effective_chat.id, text=_VOLUME_TEXT, parse_mode='Markdown')
 
 # ============================================================================
 # MONITORING COMMANDS
@@ -313,7 +492,11 @@ async def _start_monitoring_generic(update, context, token_key: str):
         return
     
     monitoring_groups[token_key] = chat_id
-    
+
+    # Register this group for the end-of-day leaderboard post
+    register_daily_chat(chat_id)
+    ensure_daily_scheduler(context.bot)
+
     await context.bot.send_message(
         chat_id=chat_id,
         text=f"🚀 Starting {token_config['name']} transaction monitoring...\n\n"
@@ -370,7 +553,11 @@ async def _start_betting_only_generic(update, context, token_key: str):
     
     # Store the chat ID for betting monitoring
     monitoring_groups[token_key] = chat_id
-    
+
+    # Register this group for the end-of-day leaderboard post
+    register_daily_chat(chat_id)
+    ensure_daily_scheduler(context.bot)
+
     await context.bot.send_message(
         chat_id=chat_id,
         text=f"🎲 starting $EMP betting 🎲\n\n"
@@ -616,7 +803,7 @@ async def _show_last_5_transactions_generic(update, context, token_key: str):
     )
     
     # Get recent transactions
-    transactions = get_last_5_transactions(token_key, w3)
+    transactions = await asyncio.to_thread(get_last_5_transactions, token_key, w3)
     
     if not transactions:
         await context.bot.send_message(
@@ -626,7 +813,7 @@ async def _show_last_5_transactions_generic(update, context, token_key: str):
         return
     
     # Format the message
-    message = format_last_5_transactions(transactions, token_key, w3)
+    message = await asyncio.to_thread(format_last_5_transactions, transactions, token_key, w3)
     
     # Send the message
     await context.bot.send_message(
@@ -663,8 +850,8 @@ async def _test_connection_generic(update, context, token_key: str):
         return
     
     try:
-        # Test basic connection
-        latest_block = w3.eth.block_number
+        # Test basic connection (blocking RPC call, so run off the event loop)
+        latest_block = await asyncio.to_thread(getattr, w3.eth, "block_number")
         await context.bot.send_message(
             chat_id=update.effective_chat.id,
             text=f"✅ **Connection Test Successful**\n\n"
@@ -675,14 +862,14 @@ async def _test_connection_generic(update, context, token_key: str):
         
         # Test pool contract
         try:
-            from config import UNISWAP_POOL_ABI
-            pool_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(token_config["pool_address"]),
-                abi=UNISWAP_POOL_ABI
-            )
-            
+            # Reuse the cached contract instance - no per-call checksum
+            # hashing or ABI rebuild
+            from transaction_utils import get_pool_contract
+            pool_contract = get_pool_contract(token_key, w3)
+
             # Try to get recent events
-            recent_events = pool_contract.events.Swap.get_logs(
+            recent_events = await asyncio.to_thread(
+                pool_contract.events.Swap.get_logs,
                 fromBlock=latest_block - 1000,
                 toBlock=latest_block
             )
@@ -690,7 +877,7 @@ async def _test_connection_generic(update, context, token_key: str):
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=f"✅ **Pool Contract Test Successful**\n\n"
-                     f"📊 Pool: {token_config['pool_address'][:8]}...{token_config['pool_address'][-6:]}\n"
+                     f"📊 Pool: {short_address(token_config['pool_address'])}\n"
                      f"🔄 Recent Swaps: {len(recent_events)} (last 1000 blocks)\n"
                      f"💎 Contract: Active"
             )
@@ -716,66 +903,63 @@ async def check_status(update, context):
     print(f"📊 Command called: /status by user {update.effective_user.id} in chat {update.effective_chat.id}")
     
     status = get_monitoring_status()
-    
-    status_text = "📊 **Monitoring Status**\n\n"
-    
+
+    # Build the report in a list and join once instead of repeated +=
+    status_lines = ["📊 **Monitoring Status**\n\n"]
+
     # Check Web3 connections
     from monitoring import get_w3_connection
-    
-    # Test Ethereum connection
-    eth_w3 = get_w3_connection("ethereum")
-    if eth_w3:
-        try:
-            latest_block = eth_w3.eth.block_number
-            status_text += f"✅ **Ethereum Connected**\n"
-            status_text += f"📦 Latest Block: {latest_block:,}\n"
-        except Exception as e:
-            status_text += f"❌ **Ethereum Error**: {str(e)}\n"
-    else:
-        status_text += f"❌ **Ethereum**: No connection configured\n"
-    
-    # Test Arbitrum connection
-    arb_w3 = get_w3_connection("arbitrum")
-    if arb_w3:
+
+    async def _probe_chain(name: str, w3):
+        if not w3:
+            return [f"❌ **{name}**: No connection configured\n"]
         try:
-            latest_block = arb_w3.eth.block_number
-            status_text += f"✅ **Arbitrum Connected**\n"
-            status_text += f"📦 Latest Block: {latest_block:,}\n"
+            latest_block = await asyncio.to_thread(getattr, w3.eth, "block_number")
+            return [f"✅ **{name} Connected**\n", f"📦 Latest Block: {latest_block:,}\n"]
         except Exception as e:
-            status_text += f"❌ **Arbitrum Error**: {str(e)}\n"
-    else:
-        status_text += f"❌ **Arbitrum**: No connection configured\n"
-    
+            return [f"❌ **{name} Error**: {str(e)}\n"]
+
+    # Probe both chains concurrently - the report waits for the slower
+    # RPC rather than the sum of both
+    eth_lines, arb_lines = await asyncio.gather(
+        _probe_chain("Ethereum", get_w3_connection("ethereum")),
+        _probe_chain("Arbitrum", get_w3_connection("arbitrum"))
+    )
+    status_lines.extend(eth_lines)
+    status_lines.extend(arb_lines)
+
     # Check monitoring status for each token
     for token_key in get_all_token_keys():
         token_config = get_token_config(token_key)
-        status_text += f"\n📊 **{token_config['name']} ({token_config['symbol']})**\n"
-        
+        status_lines.append(f"\n📊 **{token_config['name']} ({token_config['symbol']})**\n")
+
         monitoring_info = status["active_monitoring"].get(token_key, {})
         if monitoring_info.get("active"):
-            status_text += f"✅ **Monitoring Active**\n"
-            status_text += f"💬 Group ID: {monitoring_info['group_id']}\n"
-            status_text += f"📊 Pool: {monitoring_info['pool_address'][:8]}...{monitoring_info['pool_address'][-6:]}\n"
-            status_text += f"🔄 Processed TXs: {status['processed_transactions'].get(token_key, 0)}\n"
+            status_lines.append(f"✅ **Monitoring Active**\n")
+            status_lines.append(f"💬 Group ID: {monitoring_info['group_id']}\n")
+            status_lines.append(f"📊 Pool: {short_address(monitoring_info['pool_address'])}\n")
+            status_lines.append(f"🔄 Processed TXs: {status['processed_transactions'].get(token_key, 0)}\n")
         else:
-            status_text += f"❌ **Monitoring Inactive**\n"
+            status_lines.append(f"❌ **Monitoring Inactive**\n")
             if token_key == "emp":
-                status_text += f"Use /startemp to begin\n"
+                status_lines.append(f"Use /startemp to begin\n")
             else:
-                status_text += f"Use /start{token_key} to begin\n"
-    
+                status_lines.append(f"Use /start{token_key} to begin\n")
+
     # Check environment variables
-    status_text += f"\n🔧 **Configuration**\n"
-    status_text += f"INFURA_URL: {'✅ Set' if INFURA_URL else '❌ Missing'}\n"
-    status_text += f"ARBITRUM_RPC_URL: {'✅ Set' if ARBITRUM_RPC_URL else '❌ Missing'}\n"
-    
-    # Escape special characters for markdown
-    status_text = status_text.replace('_', '\\_').replace('*', '\\*').replace('[', '\\[').replace(']', '\\]').replace('(', '\\(').replace(')', '\\)').replace('~', '\\~').replace('`', '\\`').replace('>', '\\>').replace('#', '\\#').replace('+', '\\+').replace('-', '\\-').replace('=', '\\=').replace('|', '\\|').replace('{', '\\{').replace('}', '\\}').replace('.', '\\.').replace('!', '\\!')
-    
+    status_lines.append(f"\n🔧 **Configuration**\n")
+    status_lines.append(f"INFURA_URL: {'✅ Set' if INFURA_URL else '❌ Missing'}\n")
+    status_lines.append(f"ARBITRUM_RPC_URL: {'✅ Set' if ARBITRUM_RPC_URL else '❌ Missing'}\n")
+
+    # Sent as plain text: the old MarkdownV2 escape pass escaped the bold
+    # markers along with everything else, so the rendered output was
+    # already literal - skipping the 19 replace passes and the server-side
+    # parse produces the same message for less work
+    status_text = "".join(status_lines)
+
     await context.bot.send_message(
         chat_id=update.effective_chat.id,
-        text=status_text,
-        parse_mode='MarkdownV2'
+        text=status_text
     )
 
 async def test_command(update, context):
@@ -797,12 +981,14 @@ async def test_command(update, context):
 # UTILITY COMMANDS
 # ============================================================================
 
+# Compiled once at import so the dispatcher never lowercases or rescans
+# message text in Python per update
+_WEN_PATTERN = re.compile(r"wen", re.IGNORECASE)
+
 async def handle_wen_commands(update, context):
-    """Handle 'wen' commands"""
-    # Only handle if it's not a command (doesn't start with /)
-    if not update.message.text.startswith("/") and "wen" in update.message.text.lower():
-        print(f"⏰ Wen command detected by user {update.effective_user.id} in chat {update.effective_chat.id}")
-        await context.bot.send_message(chat_id=update.effective_chat.id, text="next week")
+    """Handle 'wen' commands - matching is done by the handler's filter"""
+    print(f"⏰ Wen command detected by user {update.effective_user.id} in chat {update.effective_chat.id}")
+    await context.bot.send_message(chat_id=update.effective_chat.id, text="next week")
 
 # ============================================================================
 # BETTING SYSTEM COMMANDS
@@ -931,13 +1117,24 @@ async def show_user_stats(update, context):
 
 def main():
     """Initialize and run the bot"""
-    # Validate configuration
+    # Validate configuration - exit non-zero so orchestrators see a failed
+    # start instead of a clean exit followed by a deep crash inside the build
     if not validate_config():
-        print("❌ Configuration validation failed. Please check your .env file.")
-        return
-    
-    # Create application
-    app = ApplicationBuilder().token(TOKEN).build()
+        raise SystemExit("❌ Configuration validation failed. Please check your .env file.")
+    
+    # Create application - concurrent_updates plus non-blocking handlers let
+    # slow price fetches run in parallel instead of queueing every update;
+    # 64 in-flight updates is plenty for a group bot and keeps a runaway
+    # flood from piling up unbounded tasks
+    app = (
+        ApplicationBuilder()
+        .token(TOKEN)
+        .concurrent_updates(64)
+        .defaults(Defaults(block=False))
+        .post_init(_start_price_refresher)
+        .post_shutdown(_close_http_session)
+        .build()
+    )
     
     # Add command handlers
     app.add_handler(CommandHandler("billi", send_price))
@@ -976,7 +1173,9 @@ def main():
     print("✅ Betting system commands registered")
     
     # Utility commands (must be last to avoid intercepting commands)
-    app.add_handler(MessageHandler(filters.TEXT, handle_wen_commands))
+    # The precompiled pattern means non-matching messages never invoke the
+    # handler at all
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND & filters.Regex(_WEN_PATTERN), handle_wen_commands))
     
     # Betting callback handlers
     app.add_handler(CallbackQueryHandler(handle_betting_callback))
@@ -988,8 +1187,23 @@ def main():
     print("Betting system commands: /leaderboard, /mystats")
     print("Stop commands: /stopbet, /stopbuybet")
     
-    # Use polling with drop_pending_updates to avoid conflicts
-    app.run_polling(drop_pending_updates=True)
+    # Prefer webhooks when configured - Telegram pushes updates instantly
+    # instead of the bot burning requests on the getUpdates polling loop
+    webhook_base = os.getenv("WEBHOOK_BASE")
+    webhook_secret = os.getenv("WEBHOOK_SECRET")
+    if webhook_base and webhook_secret:
+        print(f"🌐 Running in webhook mode: {webhook_base}")
+        app.run_webhook(
+            listen="0.0.0.0",
+            port=int(os.getenv("PORT", "8443")),
+            url_path=webhook_secret,
+            webhook_url=f"{webhook_base}/{webhook_secret}",
+            secret_token=webhook_secret,
+            drop_pending_updates=True
+        )
+    else:
+        # Fall back to polling with drop_pending_updates to avoid conflicts
+        app.run_polling(drop_pending_updates=True)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,9 +1,16 @@
 import os
-import dotenv
+import re
 from typing import Dict, Any
 
-# Load environment variables
-dotenv.load_dotenv()
+# Load environment variables - only bother importing and parsing dotenv when
+# a .env file actually exists; in production the orchestrator injects the
+# environment and the import/file scan is wasted startup work
+if os.path.exists(".env"):
+    try:
+        import dotenv
+        dotenv.load_dotenv()
+    except ImportError:
+        pass
 
 # Environment variables
 TOKEN = os.getenv("TOKEN")
@@ -133,9 +140,15 @@ def validate_config() -> bool:
     """Validate that all required environment variables are set"""
     required_vars = ["TOKEN"]
     missing_vars = [var for var in required_vars if not os.getenv(var)]
-    
+
     if missing_vars:
         print(f"❌ Missing required environment variables: {missing_vars}")
         return False
-    
+
+    # Catch copy-paste errors (trailing newline, truncated token) before the
+    # first round-trip to api.telegram.org
+    if TOKEN and not re.fullmatch(r"\d+:[\w-]{35,}", TOKEN):
+        print("❌ TOKEN does not look like a valid bot token (expected '<digits>:<35+ chars>')")
+        return False
+
     return True 
\ No newline at end of file
@@ -1,8 +1,8 @@
 import asyncio
 from typing import Dict, Optional
 from web3 import Web3
-from config import get_token_config, UNISWAP_POOL_ABI
-from transaction_utils import process_swap_event, get_transaction_details, get_logs_via_etherscan, processed_transactions
+from config import get_token_config
+from transaction_utils import process_swap_event, get_transaction_details, get_logs_via_etherscan, get_pool_contract, processed_transactions, SWAP_EVENT_TOPIC
 from betting_system import start_new_betting_round, resolve_betting_round
 import os
 
@@ -12,6 +12,62 @@ monitoring_groups = {}
 # Track monitoring tasks to properly stop them
 monitoring_tasks = {}
 
+# Largest block range to request in a single eth_getLogs call
+MAX_BLOCKS_PER_QUERY = 500
+
+# Blocks with this many swaps or more get one combined message instead of
+# one photo (and one rate-limit sleep) per swap
+COALESCE_MIN_EVENTS = 3
+
+def _create_swap_filter(w3: Web3, pool_contract, token_key: str):
+    """Create a server-side log filter for the pool's Swap events, or None"""
+    try:
+        swap_filter = w3.eth.filter({
+            "address": pool_contract.address,
+            "topics": [SWAP_EVENT_TOPIC],
+            "fromBlock": "latest"
+        })
+        print(f"✅ [{token_key.upper()}] Using eth_newFilter for swap events")
+        return swap_filter
+    except Exception as e:
+        print(f"⚠️ [{token_key.upper()}] Node does not support log filters ({e}), using block polling")
+        return None
+
+def _get_swap_logs_ranged(pool_contract, from_block: int, to_block: int) -> list:
+    """
+    Fetch Swap logs for a block range with one RPC call per chunk
+
+    The whole range is covered in chunks of at most MAX_BLOCKS_PER_QUERY
+    blocks (one round-trip each) instead of one call per block. Logs are
+    requested with the precomputed Swap topic so the node filters them
+    server-side and web3 skips its per-call ABI-to-topic walk; each raw
+    entry is decoded once through the contract's Swap codec. If the node
+    rejects a chunk for exceeding its 10k-result cap, that chunk is split
+    in half and retried.
+    """
+    events = []
+    swap_event = pool_contract.events.Swap()
+    start = from_block
+    while start <= to_block:
+        end = min(start + MAX_BLOCKS_PER_QUERY - 1, to_block)
+        try:
+            raw_logs = pool_contract.w3.eth.get_logs({
+                "address": pool_contract.address,
+                "topics": [SWAP_EVENT_TOPIC],
+                "fromBlock": start,
+                "toBlock": end
+            })
+            events.extend(swap_event.process_log(raw_log) for raw_log in raw_logs)
+        except Exception as e:
+            if "more than 10000 results" in str(e).lower() and end > start:
+                mid = (start + end) // 2
+                events.extend(_get_swap_logs_ranged(pool_contract, start, mid))
+                events.extend(_get_swap_logs_ranged(pool_contract, mid + 1, end))
+            else:
+                raise
+        start = end + 1
+    return events
+
 async def monitor_transactions(bot, token_key: str = "emp", group_id: int = None, send_transaction_messages: bool = True):
     """Monitor Uniswap pool for new transactions for a specific token"""
     global monitoring_groups, processed_transactions, monitoring_tasks
@@ -37,26 +93,23 @@ async def monitor_transactions(bot, token_key: str = "emp", group_id: int = None
     monitoring_tasks[token_key] = task
     
     try:
-        # Create contract instance
-        pool_contract = w3.eth.contract(
-            address=Web3.to_checksum_address(token_config["pool_address"]),
-            abi=UNISWAP_POOL_ABI
-        )
-        
+        # Reuse the cached contract instance
+        pool_contract = get_pool_contract(token_key, w3)
+
         mode_text = "betting-only" if not send_transaction_messages else "full monitoring"
         print(f"Starting {mode_text} for {token_key} pool: {token_config['pool_address']}")
         print(f"Posting updates to group chat: {group_id}")
         
-        # Get latest block with error handling
+        # Get latest block with error handling (blocking RPC, so off-loop)
         try:
-            latest_block = w3.eth.block_number
+            latest_block = await asyncio.to_thread(getattr, w3.eth, "block_number")
             print(f"Starting from block: {latest_block}")
         except Exception as e:
             if "429" in str(e) or "Too Many Requests" in str(e):
                 print(f"Rate limited during startup for {token_key}, waiting 60 seconds before retrying...")
                 await asyncio.sleep(60)
                 try:
-                    latest_block = w3.eth.block_number
+                    latest_block = await asyncio.to_thread(getattr, w3.eth, "block_number")
                     print(f"Retry successful, starting from block: {latest_block}")
                 except Exception as e2:
                     print(f"Still rate limited for {token_key}: {e2}")
@@ -68,19 +121,49 @@ async def monitor_transactions(bot, token_key: str = "emp", group_id: int = None
         # Set polling interval based on network
         if network == "ethereum":
             polling_interval = 15  # 15 seconds for Ethereum
-            max_blocks_per_call = 5  # Process more blocks for Ethereum
             skip_threshold = 8  # Skip if more than 8 blocks behind
         else:  # arbitrum
             polling_interval = 1  # 1 second for Arbitrum
-            max_blocks_per_call = 50  # Process up to 50 blocks for Arbitrum (conservative)
             skip_threshold = 100  # Skip if more than 100 blocks behind
-        
+
+        # Prefer a server-side log filter: one cheap eth_getFilterChanges
+        # poll per cycle instead of block_number + ranged get_logs calls.
+        # Not every provider supports filters, so block polling remains the
+        # fallback.
+        swap_filter = await asyncio.to_thread(_create_swap_filter, w3, pool_contract, token_key)
+
         while token_key in monitoring_groups:  # Check if monitoring should continue
             try:
+                if swap_filter is not None:
+                    try:
+                        raw_logs = await asyncio.to_thread(swap_filter.get_new_entries)
+                    except Exception as e:
+                        if "429" in str(e) or "Too Many Requests" in str(e):
+                            print(f"⚠️ Rate limited polling swap filter for {token_key}, waiting 30 seconds...")
+                            await asyncio.sleep(30)
+                            continue
+                        # Filters expire server-side after inactivity - try to
+                        # recreate once, otherwise fall back to block polling
+                        print(f"⚠️ Swap filter failed for {token_key} ({e}), recreating...")
+                        swap_filter = await asyncio.to_thread(_create_swap_filter, w3, pool_contract, token_key)
+                        continue
+
+                    if raw_logs:
+                        print(f"✅ [{token_key.upper()}] Filter returned {len(raw_logs)} new swap logs")
+                    decoded_events = []
+                    for raw_log in raw_logs:
+                        try:
+                            decoded_events.append(pool_contract.events.Swap().process_log(raw_log))
+                        except Exception as e:
+                            print(f"❌ Could not decode swap log for {token_key}: {e}")
+                    await _dispatch_swap_events(decoded_events, token_key, group_id, bot, w3, send_transaction_messages)
+
+                    await asyncio.sleep(polling_interval)
+                    continue
                 # Get new blocks with rate limiting
                 try:
                     print(f"🔍 [{token_key.upper()}] Getting current block number... (1 credit)")
-                    current_block = w3.eth.block_number
+                    current_block = await asyncio.to_thread(getattr, w3.eth, "block_number")
                     print(f"✅ [{token_key.upper()}] Current block: {current_block}")
                 except Exception as e:
                     if "429" in str(e) or "Too Many Requests" in str(e):
@@ -102,53 +185,45 @@ async def monitor_transactions(bot, token_key: str = "emp", group_id: int = None
                             latest_block = current_block - 2  # Skip to last 2 blocks
                             continue
                         
-                        # Process blocks in smaller batches
-                        blocks_processed = 0
-                        while blocks_processed < blocks_to_process:
-                            batch_size = min(max_blocks_per_call, blocks_to_process - blocks_processed)
-                            start_block = latest_block + blocks_processed + 1
-                            end_block = start_block + batch_size - 1
-                            
-                            print(f"🔍 [{token_key.upper()}] Getting events from blocks {start_block}-{end_block} ({batch_size} blocks)... (~10 credits)")
-                            
-                            try:
-                                # Get events from the pool contract
-                                events = pool_contract.events.Swap.get_logs(
-                                    fromBlock=start_block,
-                                    toBlock=end_block
+                        # Cover the whole new range with one ranged query
+                        # instead of one eth_getLogs call per block
+                        start_block = latest_block + 1
+                        print(f"🔍 [{token_key.upper()}] Getting events from blocks {start_block}-{current_block} ({blocks_to_process} blocks) in one query...")
+
+                        try:
+                            # Both fetches are blocking HTTP - keep them off
+                            # the event loop so handlers stay responsive
+                            events = await asyncio.to_thread(
+                                _get_swap_logs_ranged, pool_contract, start_block, current_block
+                            )
+
+                            if not events:
+                                print(f"🔍 [{token_key.upper()}] No Swap events found, checking for other event types...")
+                                # Try getting logs via Etherscan as fallback
+                                events = await asyncio.to_thread(
+                                    get_logs_via_etherscan,
+                                    token_config["pool_address"],
+                                    start_block,
+                                    current_block,
+                                    token_key
                                 )
-                                
-                                if not events:
-                                    print(f"🔍 [{token_key.upper()}] No Swap events found, checking for other event types...")
-                                    # Try getting logs via Etherscan as fallback
-                                    events = get_logs_via_etherscan(
-                                        token_config["pool_address"],
-                                        start_block,
-                                        end_block,
-                                        token_key
-                                    )
-                                    if events is None:
-                                        events = []
-                                
-                                print(f"✅ [{token_key.upper()}] Retrieved logs via Web3")
-                                print(f"✅ [{token_key.upper()}] Found {len(events)} events from blocks {start_block} to {end_block} for {token_key.upper()} on {network.upper()}")
-                                
-                                # Process each event
-                                for event in events:
-                                    await process_transaction_event(event, token_key, group_id, bot, w3, send_transaction_messages)
-                                
-                                blocks_processed += batch_size
-                                
-                            except Exception as e:
-                                if "429" in str(e) or "Too Many Requests" in str(e):
-                                    print(f"⚠️ Rate limited during event processing for {token_key}, waiting 30 seconds...")
-                                    await asyncio.sleep(30)
-                                    continue
-                                else:
-                                    print(f"❌ Error processing events for {token_key}: {e}")
-                                    blocks_processed += batch_size
-                                    continue
-                        
+                                if events is None:
+                                    events = []
+
+                            print(f"✅ [{token_key.upper()}] Retrieved logs via Web3")
+                            print(f"✅ [{token_key.upper()}] Found {len(events)} events from blocks {start_block} to {current_block} for {token_key.upper()} on {network.upper()}")
+
+                            # Process the events, coalescing same-block bursts
+                            await _dispatch_swap_events(events, token_key, group_id, bot, w3, send_transaction_messages)
+
+                        except Exception as e:
+                            if "429" in str(e) or "Too Many Requests" in str(e):
+                                print(f"⚠️ Rate limited during event processing for {token_key}, waiting 30 seconds...")
+                                await asyncio.sleep(30)
+                                continue
+                            else:
+                                print(f"❌ Error processing events for {token_key}: {e}")
+
                         latest_block = current_block
                         
                     except Exception as e:
@@ -188,32 +263,57 @@ async def monitor_transactions_buy_only(bot, token_key: str, group_id: int):
         token_config = get_token_config(token_key)
         network = token_config["network"]
         
-        # Initialize Web3 connection
+        # Initialize Web3 connection (the connectivity probe is a real RPC
+        # round-trip, so keep it off the event loop)
         w3 = get_w3_connection(network)
-        if not w3 or not w3.is_connected():
+        if not w3 or not await asyncio.to_thread(w3.is_connected):
             print(f"❌ Failed to connect to {network} network")
             return
         
         # Store the group ID and task
         monitoring_groups[token_key] = group_id
-        
-        # Create contract instance
-        pool_contract = w3.eth.contract(
-            address=Web3.to_checksum_address(token_config["pool_address"]),
-            abi=UNISWAP_POOL_ABI
-        )
+
+        # Reuse the cached contract instance
+        pool_contract = get_pool_contract(token_key, w3)
         
         # Get starting block
-        latest_block = w3.eth.block_number - 1
+        latest_block = await asyncio.to_thread(getattr, w3.eth, "block_number") - 1
         MONITORING_INTERVAL = 5  # seconds
         skip_threshold = 500
-        max_blocks_per_call = 50
         
         print(f"✅ [{token_key.upper()}] Connected to {network} network. Starting buy-only monitoring from block {latest_block}")
-        
+
+        # Same filter-first strategy as the full monitor loop: one cheap
+        # eth_getFilterChanges poll per cycle, block polling as fallback
+        swap_filter = await asyncio.to_thread(_create_swap_filter, w3, pool_contract, token_key)
+
         while token_key in monitoring_groups and monitoring_groups[token_key] == group_id:
             try:
-                current_block = w3.eth.block_number
+                if swap_filter is not None:
+                    try:
+                        raw_logs = await asyncio.to_thread(swap_filter.get_new_entries)
+                    except Exception as e:
+                        if "429" in str(e) or "Too Many Requests" in str(e):
+                            print(f"⚠️ Rate limited polling swap filter for {token_key} (buy-only), waiting 30 seconds...")
+                            await asyncio.sleep(30)
+                            continue
+                        print(f"⚠️ Swap filter failed for {token_key} (buy-only, {e}), recreating...")
+                        swap_filter = await asyncio.to_thread(_create_swap_filter, w3, pool_contract, token_key)
+                        continue
+
+                    if raw_logs:
+                        print(f"✅ [{token_key.upper()}] Filter returned {len(raw_logs)} new swap logs (buy-only)")
+                    for raw_log in raw_logs:
+                        try:
+                            event = pool_contract.events.Swap().process_log(raw_log)
+                        except Exception as e:
+                            print(f"❌ Could not decode swap log for {token_key}: {e}")
+                            continue
+                        await process_transaction_event_buy_only(event, token_key, group_id, bot, w3)
+
+                    await asyncio.sleep(MONITORING_INTERVAL)
+                    continue
+                current_block = await asyncio.to_thread(getattr, w3.eth, "block_number")
                 print(f"🔍 [{token_key.upper()}] Getting current block number... (1 credit)")
                 print(f"✅ [{token_key.upper()}] Current block: {current_block}")
                 
@@ -225,52 +325,43 @@ async def monitor_transactions_buy_only(bot, token_key: str, group_id: int):
                         latest_block = current_block - 2
                         continue
                     
-                    # Process blocks in batches
-                    blocks_processed = 0
-                    while blocks_processed < blocks_to_process:
-                        batch_size = min(max_blocks_per_call, blocks_to_process - blocks_processed)
-                        start_block = latest_block + blocks_processed + 1
-                        end_block = start_block + batch_size - 1
-                        
-                        print(f"🔍 [{token_key.upper()}] Getting events from blocks {start_block}-{end_block} ({batch_size} blocks) for buy-only... (~10 credits)")
-                        
-                        try:
-                            # Get events from the pool contract
-                            events = pool_contract.events.Swap.get_logs(
-                                fromBlock=start_block,
-                                toBlock=end_block
+                    # Cover the whole new range with one ranged query
+                    start_block = latest_block + 1
+                    print(f"🔍 [{token_key.upper()}] Getting events from blocks {start_block}-{current_block} ({blocks_to_process} blocks) for buy-only in one query...")
+
+                    try:
+                        # Blocking HTTP - run off the event loop
+                        events = await asyncio.to_thread(
+                            _get_swap_logs_ranged, pool_contract, start_block, current_block
+                        )
+
+                        if not events:
+                            print(f"🔍 [{token_key.upper()}] No Swap events found, checking for other event types...")
+                            events = await asyncio.to_thread(
+                                get_logs_via_etherscan,
+                                token_config["pool_address"],
+                                start_block,
+                                current_block,
+                                token_key
                             )
-                            
-                            if not events:
-                                print(f"🔍 [{token_key.upper()}] No Swap events found, checking for other event types...")
-                                events = get_logs_via_etherscan(
-                                    token_config["pool_address"],
-                                    start_block,
-                                    end_block,
-                                    token_key
-                                )
-                                if events is None:
-                                    events = []
-                            
-                            print(f"✅ [{token_key.upper()}] Retrieved logs via Web3")
-                            print(f"✅ [{token_key.upper()}] Found {len(events)} events from blocks {start_block} to {end_block} for {token_key.upper()} (buy-only mode)")
-                            
-                            # Process each event in buy-only mode
-                            for event in events:
-                                await process_transaction_event_buy_only(event, token_key, group_id, bot, w3)
-                            
-                            blocks_processed += batch_size
-                            
-                        except Exception as e:
-                            if "429" in str(e) or "Too Many Requests" in str(e):
-                                print(f"⚠️ Rate limited during buy-only event processing for {token_key}, waiting 30 seconds...")
-                                await asyncio.sleep(30)
-                                continue
-                            else:
-                                print(f"❌ Error processing buy-only events for {token_key}: {e}")
-                                blocks_processed += batch_size
-                                continue
-                    
+                            if events is None:
+                                events = []
+
+                        print(f"✅ [{token_key.upper()}] Retrieved logs via Web3")
+                        print(f"✅ [{token_key.upper()}] Found {len(events)} events from blocks {start_block} to {current_block} for {token_key.upper()} (buy-only mode)")
+
+                        # Process each event in buy-only mode
+                        for event in events:
+                            await process_transaction_event_buy_only(event, token_key, group_id, bot, w3)
+
+                    except Exception as e:
+                        if "429" in str(e) or "Too Many Requests" in str(e):
+                            print(f"⚠️ Rate limited during buy-only event processing for {token_key}, waiting 30 seconds...")
+                            await asyncio.sleep(30)
+                            continue
+                        else:
+                            print(f"❌ Error processing buy-only events for {token_key}: {e}")
+
                     latest_block = current_block
                 
                 await asyncio.sleep(MONITORING_INTERVAL)
@@ -290,6 +381,26 @@ async def monitor_transactions_buy_only(bot, token_key: str, group_id: int):
     finally:
         print(f"🏁 Buy-only monitoring task ended for {token_key}")
 
+# Telegram file_ids for the buy/sell images - each image is uploaded once,
+# after which the ~100KB file is resent server-side by its id
+_photo_file_ids = {}
+
+async def _send_trade_photo(bot, chat_id: int, image_path: str, caption: str):
+    """Send a trade image, reusing Telegram's cached file_id after the first upload"""
+    fid = _photo_file_ids.get(image_path)
+    if fid:
+        try:
+            await bot.send_photo(chat_id=chat_id, photo=fid, caption=caption, parse_mode='Markdown')
+            return
+        except Exception as e:
+            print(f"⚠️ Cached file_id for {image_path} failed ({e}), re-uploading...")
+            _photo_file_ids.pop(image_path, None)
+
+    with open(image_path, 'rb') as photo:
+        msg = await bot.send_photo(chat_id=chat_id, photo=photo, caption=caption, parse_mode='Markdown')
+    if msg.photo:
+        _photo_file_ids[image_path] = msg.photo[-1].file_id
+
 async def process_transaction_event(event: Dict, token_key: str, group_id: int, bot, w3: Web3, send_transaction_messages: bool = True):
     """Process a single transaction event"""
     try:
@@ -307,9 +418,10 @@ async def process_transaction_event(event: Dict, token_key: str, group_id: int,
         processed_transactions[token_key].add(tx_hash)
         
         print(f"🔍 [{token_key.upper()}] Processing new transaction: {tx_hash[:10]}...")
-        
-        # Process the swap event to get formatted message and price
-        result = process_swap_event(event, tx_hash, token_key, w3)
+
+        # Process the swap event in a worker thread - it makes blocking price
+        # and RPC calls that would otherwise stall the event loop
+        result = await asyncio.to_thread(process_swap_event, event, tx_hash, token_key, w3)
         
         if len(result) == 3:
             message, direction, price_per_token = result
@@ -328,13 +440,7 @@ async def process_transaction_event(event: Dict, token_key: str, group_id: int,
                     # Use sell-specific image
                     image_path = token_config["sell_image"]
                     if os.path.exists(image_path):
-                        with open(image_path, 'rb') as photo:
-                            await bot.send_photo(
-                                chat_id=group_id,
-                                photo=photo,
-                                caption=message,
-                                parse_mode='Markdown'
-                            )
+                        await _send_trade_photo(bot, group_id, image_path, message)
                         print(f"📤 [{token_key.upper()}] Posted SELL transaction with image: {tx_hash[:10]}...")
                     else:
                         # Fallback to text-only
@@ -353,13 +459,7 @@ async def process_transaction_event(event: Dict, token_key: str, group_id: int,
                     # Use buy-specific image
                     image_path = token_config["buy_image"]
                     if os.path.exists(image_path):
-                        with open(image_path, 'rb') as photo:
-                            await bot.send_photo(
-                                chat_id=group_id,
-                                photo=photo,
-                                caption=message,
-                                parse_mode='Markdown'
-                            )
+                        await _send_trade_photo(bot, group_id, image_path, message)
                         print(f"📤 [{token_key.upper()}] Posted BUY transaction with image: {tx_hash[:10]}...")
                     else:
                         # Fallback to text-only
@@ -384,18 +484,112 @@ async def process_transaction_event(event: Dict, token_key: str, group_id: int,
                     print(f"📤 [{token_key.upper()}] Posted SWAP transaction: {tx_hash[:10]}...")
                 except Exception as e:
                     print(f"❌ Error sending text-only message for {token_key}: {e}")
+
+            # Small delay between Telegram sends to avoid rate limits; no
+            # point paying it when nothing was posted
+            await asyncio.sleep(1)
         else:
             print(f"🎲 [{token_key.upper()}] Skipping transaction message (betting-only mode): {tx_hash[:10]}...")
-        
-        # Small delay to avoid rate limits
-        await asyncio.sleep(1)
-        
+
         # Handle betting system with transaction price
         await handle_betting_for_transaction(token_key, price_per_token, group_id, bot)
         
     except Exception as e:
         print(f"❌ Error processing transaction event for {token_key}: {e}")
 
+async def _dispatch_swap_events(events: list, token_key: str, group_id: int, bot, w3: Web3, send_transaction_messages: bool = True):
+    """
+    Route swap events to the right sender
+
+    Events are grouped by block number. Blocks with COALESCE_MIN_EVENTS or
+    more swaps get one combined message (one send_photo and one rate-limit
+    sleep for the whole block); smaller groups go through the normal
+    per-event path.
+    """
+    events_by_block = {}
+    for event in events:
+        events_by_block.setdefault(event.get("blockNumber"), []).append(event)
+
+    for block_number, block_events in events_by_block.items():
+        if send_transaction_messages and block_number is not None and len(block_events) >= COALESCE_MIN_EVENTS:
+            await _process_block_burst(block_events, block_number, token_key, group_id, bot, w3)
+        else:
+            for event in block_events:
+                await process_transaction_event(event, token_key, group_id, bot, w3, send_transaction_messages)
+
+async def _process_block_burst(block_events: list, block_number: int, token_key: str, group_id: int, bot, w3: Web3):
+    """Post one combined message for a burst of swaps in the same block"""
+    try:
+        token_config = get_token_config(token_key)
+        token_symbol = token_config["symbol"]
+        explorer_url = token_config["explorer_url"]
+
+        print(f"⚡ [{token_key.upper()}] {len(block_events)} swaps in block {block_number}, posting combined message...")
+
+        trades = []
+        for event in block_events:
+            tx_hash = event.get('transactionHash', 'unknown')
+            if isinstance(tx_hash, bytes):
+                tx_hash = tx_hash.hex()
+
+            if tx_hash in processed_transactions[token_key]:
+                print(f"⏭️ [{token_key.upper()}] Skipping already processed transaction: {tx_hash[:10]}...")
+                continue
+            processed_transactions[token_key].add(tx_hash)
+
+            result = await asyncio.to_thread(process_swap_event, event, tx_hash, token_key, w3)
+            if len(result) == 3:
+                message, direction, price_per_token = result
+            else:
+                message, direction = result
+                price_per_token = None
+
+            # Only BUY/SELL swaps belong in the summary
+            if direction in ("🟢 BUY", "🔴 SELL"):
+                trades.append((tx_hash, direction, price_per_token))
+
+        if not trades:
+            return
+
+        buys = sum(1 for _, direction, _ in trades if direction == "🟢 BUY")
+        sells = len(trades) - buys
+
+        lines = []
+        for tx_hash, direction, price_per_token in trades:
+            price_text = f" at **${price_per_token:,.4f}**" if price_per_token else ""
+            lines.append(f"{direction}{price_text} — [{tx_hash[:10]}...]({explorer_url}/tx/{tx_hash})")
+
+        caption = (
+            f"⚡ **{len(trades)} ${token_symbol} swaps in block {block_number}** "
+            f"({buys} 🟢 / {sells} 🔴)\n\n" + "\n".join(lines)
+        )
+
+        # Pick the image by majority direction
+        image_path = token_config["buy_image"] if buys >= sells else token_config["sell_image"]
+        try:
+            if os.path.exists(image_path):
+                await _send_trade_photo(bot, group_id, image_path, caption)
+            else:
+                await bot.send_message(
+                    chat_id=group_id,
+                    text=caption,
+                    parse_mode='Markdown',
+                    disable_web_page_preview=True
+                )
+            print(f"📤 [{token_key.upper()}] Posted combined message for {len(trades)} swaps in block {block_number}")
+        except Exception as e:
+            print(f"❌ Error sending combined swap message for {token_key}: {e}")
+
+        # One rate-limit pause and one betting update for the whole block
+        # instead of one per swap
+        await asyncio.sleep(1)
+        last_price = next((price for _, _, price in reversed(trades) if price), None)
+        if last_price:
+            await handle_betting_for_transaction(token_key, last_price, group_id, bot)
+
+    except Exception as e:
+        print(f"❌ Error processing block burst for {token_key}: {e}")
+
 async def process_transaction_event_buy_only(event: Dict, token_key: str, group_id: int, bot, w3: Web3):
     """Process a single transaction event for buy-only betting mode"""
     try:
@@ -413,9 +607,10 @@ async def process_transaction_event_buy_only(event: Dict, token_key: str, group_
         processed_transactions[token_key].add(tx_hash)
         
         print(f"🔍 [{token_key.upper()}] Processing new transaction for buy-only betting: {tx_hash[:10]}...")
-        
-        # Process the swap event to get formatted message and price
-        result = process_swap_event(event, tx_hash, token_key, w3)
+
+        # Process the swap event in a worker thread - it makes blocking price
+        # and RPC calls that would otherwise stall the event loop
+        result = await asyncio.to_thread(process_swap_event, event, tx_hash, token_key, w3)
         
         if len(result) == 3:
             message, direction, price_per_token = result
@@ -423,12 +618,10 @@ async def process_transaction_event_buy_only(event: Dict, token_key: str, group_
             message, direction = result
             price_per_token = None
         
-        # Never send transaction messages in buy-only mode
+        # Never send transaction messages in buy-only mode, so no Telegram
+        # rate-limit pause is needed here
         print(f"🟢 [{token_key.upper()}] Skipping transaction message (buy-only mode): {tx_hash[:10]}... Direction: {direction}")
-        
-        # Small delay to avoid rate limits
-        await asyncio.sleep(1)
-        
+
         # Handle buy-only betting system - only process BUY transactions for betting
         await handle_buy_only_betting_for_transaction(token_key, price_per_token, group_id, bot, direction)
         
@@ -512,17 +705,28 @@ async def handle_buy_only_betting_for_transaction(token_key: str, transaction_pr
         import traceback
         traceback.print_exc()
 
+# Web3 instances cached per network so repeat callers share one provider
+# (and its underlying HTTP session) instead of rebuilding it every call
+_w3_connections = {}
+
 def get_w3_connection(network: str) -> Optional[Web3]:
     """Get Web3 connection for a specific network"""
     from config import INFURA_URL, ARBITRUM_RPC_URL
-    
+
+    w3 = _w3_connections.get(network)
+    if w3 is not None:
+        return w3
+
     if network == "ethereum" and INFURA_URL:
-        return Web3(Web3.HTTPProvider(INFURA_URL))
+        w3 = Web3(Web3.HTTPProvider(INFURA_URL))
     elif network == "arbitrum" and ARBITRUM_RPC_URL:
-        return Web3(Web3.HTTPProvider(ARBITRUM_RPC_URL))
+        w3 = Web3(Web3.HTTPProvider(ARBITRUM_RPC_URL))
     else:
         return None
 
+    _w3_connections[network] = w3
+    return w3
+
 def get_monitoring_status() -> Dict:
     """Get current monitoring status"""
     status = {
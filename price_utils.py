@@ -1,12 +1,53 @@
+import json
+import os
 import requests
+import threading
 import time
 from typing import Optional, Tuple
 from config import ETHERSCAN_API_KEY, CACHE_DURATION
 
+# Decode API responses with orjson when available - the Rust parser is a
+# few times faster than response.json() and this runs on every API call
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _json_loads(data):
+        return json.loads(data)
+
+# Shared HTTP session so repeated API calls reuse the same TCP/TLS connection
+# instead of paying a full handshake on every request; transient server/rate
+# limit errors get a couple of backed-off retries at the transport layer
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=requests.adapters.Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+_session.headers.update({"Connection": "keep-alive"})
+
 # Simple price cache to reduce API calls
 price_cache = {}
 price_cache_timestamp = 0
 
+# TTL cache for the pool-based EMP price so bursts of price commands share
+# one set of Etherscan calls instead of each paying the full round-trip
+_pool_price_cache = None
+_pool_price_timestamp = 0.0
+_POOL_PRICE_TTL = 30.0
+
 def unified_etherscan_api_call(module: str, action: str, chainid: int = 1, **params) -> Optional[dict]:
     """
     Make a unified Etherscan V2 API call
@@ -34,9 +75,9 @@ def unified_etherscan_api_call(module: str, action: str, chainid: int = 1, **par
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _session.get(url, params=params, timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get("status") == "1":
                 return data.get("result")
             else:
@@ -87,15 +128,28 @@ def eth_usd() -> Optional[float]:
         return prices[0]  # USD price
     return None
 
-def get_emp_price_from_pool() -> Optional[float]:
+def get_emp_price_from_pool(eth_usd_price: Optional[float] = None) -> Optional[float]:
     """
     Get EMP token price using Etherscan API and Uniswap V3 pool contract
     OPTIMIZED VERSION: Uses hardcoded addresses to minimize API calls
-    
+
+    Args:
+        eth_usd_price: Already-fetched ETH price to reuse; when omitted the
+                       price is fetched here (one extra API call)
+
     Returns:
         EMP price in USD as float or None if failed
     """
+    global _pool_price_cache, _pool_price_timestamp
+
     try:
+        # Serve recent results from memory - bursts of /billi, /price and
+        # /empprice within the TTL share a single pair of API calls
+        now = time.monotonic()
+        if _pool_price_cache is not None and now - _pool_price_timestamp < _POOL_PRICE_TTL:
+            print(f"💾 Using cached EMP pool price: ${_pool_price_cache:.6f}")
+            return _pool_price_cache
+
         api_key = ETHERSCAN_API_KEY
         if not api_key:
             print("❌ EMP Price Error: No Etherscan API key configured")
@@ -126,13 +180,13 @@ def get_emp_price_from_pool() -> Optional[float]:
             }
             try:
                 print(f"🔍 Making API call: {call_name}")
-                r = requests.get(base_url, params=params, timeout=15)
+                r = _session.get(base_url, params=params, timeout=15)
                 
                 if r.status_code != 200:
                     print(f"❌ {call_name} - HTTP Error {r.status_code}: {r.text[:100]}")
                     return None
                 
-                response_data = r.json()
+                response_data = _json_loads(r.content)
                 
                 # Check for API errors in response
                 if 'status' in response_data and response_data['status'] == '0':
@@ -177,13 +231,17 @@ def get_emp_price_from_pool() -> Optional[float]:
             print(f"Raw slot0 data: {slot0_data}")
             return None
 
-        # STEP 2: Get ETH price for USD conversion
-        print("📊 Step 2/2: Getting ETH price for USD conversion...")
-        eth_usd_price = eth_usd()
-        if not eth_usd_price:
-            print("❌ Step 2 Failed: Could not get ETH price for USD conversion")
-            return None
-        print(f"✅ Step 2 Complete: ETH price = ${eth_usd_price}")
+        # STEP 2: Get ETH price for USD conversion (skipped when the caller
+        # already has it - no point in a second round-trip)
+        if eth_usd_price:
+            print(f"📊 Step 2/2: Reusing caller's ETH price = ${eth_usd_price}")
+        else:
+            print("📊 Step 2/2: Getting ETH price for USD conversion...")
+            eth_usd_price = eth_usd()
+            if not eth_usd_price:
+                print("❌ Step 2 Failed: Could not get ETH price for USD conversion")
+                return None
+            print(f"✅ Step 2 Complete: ETH price = ${eth_usd_price}")
 
         # Calculate price ratio from sqrtPriceX96
         print("🧮 Calculating price from pool data...")
@@ -202,6 +260,8 @@ def get_emp_price_from_pool() -> Optional[float]:
         
         print(f"🎉 SUCCESS: EMP price calculated = ${emp_usd_price:.6f}")
         print(f"⚡ Optimized: Only 2 API calls instead of 6!")
+        _pool_price_cache = emp_usd_price
+        _pool_price_timestamp = now
         return emp_usd_price
         
     except Exception as e:
@@ -211,30 +271,48 @@ def get_emp_price_from_pool() -> Optional[float]:
         traceback.print_exc()
         return None
 
-def get_cached_prices(token_symbol: str = None) -> Tuple[float, float]:
-    """Get cached prices or fetch new ones if cache is expired"""
+# Stale-while-revalidate window: between CACHE_DURATION and this age the
+# cached prices are served immediately while one background thread refreshes
+PRICE_STALE_DURATION = 600
+
+# Sidecar file so a restart can reuse a recent price instead of paying a
+# cold fetch; the file's mtime doubles as the cache timestamp
+PRICE_CACHE_FILE = "price_cache.json"
+
+try:
+    if os.path.exists(PRICE_CACHE_FILE):
+        _mtime = os.path.getmtime(PRICE_CACHE_FILE)
+        if time.time() - _mtime < PRICE_STALE_DURATION:
+            with open(PRICE_CACHE_FILE, 'r') as _f:
+                price_cache = json.load(_f)
+            price_cache_timestamp = _mtime
+            print(f"💾 Loaded price cache from disk: {price_cache}")
+except (OSError, json.JSONDecodeError) as _e:
+    print(f"⚠️ Could not load price cache file: {_e}")
+
+_price_refresh_lock = threading.Lock()
+_price_refreshing = False
+
+def _prices_from_cache(token_symbol: str = None) -> Tuple[float, float]:
+    """Return the cached (token, ETH) price pair in the shape callers expect"""
+    eth_price = price_cache.get("eth_usd_price", 0)
+    if token_symbol == "T":
+        # For Talos, we only need ETH price for Arbitrum
+        print(f"Using cached prices - ETH: ${eth_price}")
+        return 0, eth_price  # Return 0 for token price, ETH price for calculations
+    else:
+        emp_price = price_cache.get("emp_usd_price", 0)
+        print(f"Using cached prices - EMP: ${emp_price}, ETH: ${eth_price}")
+        return emp_price, eth_price
+
+def _fetch_prices(token_symbol: str = None):
+    """Fetch fresh prices from the APIs and update the module cache"""
     global price_cache, price_cache_timestamp
-    
-    current_time = time.time()
-    
-    # Return cached prices if still valid
-    if current_time - price_cache_timestamp < CACHE_DURATION and price_cache:
-        if token_symbol == "T":
-            # For Talos, we need ETH price for Arbitrum
-            eth_price = price_cache.get("eth_usd_price", 0)
-            print(f"Using cached prices - ETH: ${eth_price}")
-            return 0, eth_price  # Return 0 for token price, ETH price for calculations
-        else:
-            # For EMP, return both prices
-            emp_price = price_cache.get("emp_usd_price", 0)
-            eth_price = price_cache.get("eth_usd_price", 0)
-            print(f"Using cached prices - EMP: ${emp_price}, ETH: ${eth_price}")
-            return emp_price, eth_price
-    
+
     # Get ETH price using Etherscan API
     eth_usd_price = 0
     emp_usd_price = 0
-    
+
     try:
         print("🔍 Getting ETH price from Etherscan API... (~1 credit)")
         eth_price = eth_usd()
@@ -245,12 +323,13 @@ def get_cached_prices(token_symbol: str = None) -> Tuple[float, float]:
             print("❌ Etherscan ETH price failed")
     except Exception as e:
         print(f"❌ Etherscan API failed: {e}")
-    
-    # For EMP price, use the new pool-based function
+
+    # For EMP price, use the new pool-based function, reusing the ETH price
+    # fetched above so it doesn't issue its own duplicate call
     if token_symbol != "T":  # Only get EMP price for EMP transactions
         try:
             print("🔍 Getting EMP price from pool contract... (~1 credit)")
-            emp_price = get_emp_price_from_pool()
+            emp_price = get_emp_price_from_pool(eth_usd_price or None)
             if emp_price:
                 emp_usd_price = emp_price
                 print(f"✅ Pool-based EMP price: ${emp_usd_price}")
@@ -258,14 +337,73 @@ def get_cached_prices(token_symbol: str = None) -> Tuple[float, float]:
                 print("❌ Pool-based EMP price failed")
         except Exception as e:
             print(f"❌ Pool-based EMP price failed: {e}")
-    
+
+    # A partial failure shouldn't wipe a price we already had - keep the
+    # last good value instead of caching 0
+    if not eth_usd_price:
+        eth_usd_price = price_cache.get("eth_usd_price", 0)
+    if not emp_usd_price:
+        emp_usd_price = price_cache.get("emp_usd_price", 0)
+
     # Update cache with whatever we got
     price_cache = {
         "emp_usd_price": emp_usd_price,
         "eth_usd_price": eth_usd_price
     }
-    price_cache_timestamp = current_time
-    
+    price_cache_timestamp = time.time()
+
+    # Mirror to disk so the next process start skips the cold fetch
+    try:
+        with open(PRICE_CACHE_FILE, 'w') as f:
+            json.dump(price_cache, f)
+    except OSError as e:
+        print(f"⚠️ Could not save price cache file: {e}")
+
+def _refresh_prices_background(token_symbol: str = None):
+    """Refresh the price cache from a background thread"""
+    global _price_refreshing
+    try:
+        _fetch_prices(token_symbol)
+    finally:
+        with _price_refresh_lock:
+            _price_refreshing = False
+
+def get_cached_prices(token_symbol: str = None) -> Tuple[float, float]:
+    """
+    Get cached prices, fetching new ones if the cache is expired
+
+    Fresh entries (< CACHE_DURATION old) are returned directly. Entries up to
+    PRICE_STALE_DURATION old are still returned immediately but kick off a
+    single background refresh (stale-while-revalidate), so hot paths only
+    block on the price APIs after a long quiet spell.
+    """
+    global _price_refreshing
+
+    age = time.time() - price_cache_timestamp
+
+    if price_cache and age < CACHE_DURATION:
+        return _prices_from_cache(token_symbol)
+
+    if price_cache and age < PRICE_STALE_DURATION:
+        # Serve the stale value now; refresh behind the scenes unless a
+        # refresh is already running
+        with _price_refresh_lock:
+            should_refresh = not _price_refreshing
+            if should_refresh:
+                _price_refreshing = True
+        if should_refresh:
+            threading.Thread(
+                target=_refresh_prices_background,
+                args=(token_symbol,),
+                daemon=True
+            ).start()
+        return _prices_from_cache(token_symbol)
+
+    # Cache empty or too old - do a blocking refresh
+    _fetch_prices(token_symbol)
+
+    emp_usd_price = price_cache.get("emp_usd_price", 0)
+    eth_usd_price = price_cache.get("eth_usd_price", 0)
     if token_symbol == "T":
         print(f"Final prices - ETH: ${eth_usd_price}")
         return 0, eth_usd_price  # Return 0 for token price, ETH price for calculations
@@ -1,16 +1,250 @@
 import asyncio
+import math
+import sqlite3
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
+
 from web3 import Web3
 from config import TOKENS, UNISWAP_POOL_ABI, get_token_config
-from price_utils import get_cached_prices, unified_etherscan_api_call
+from price_utils import get_cached_prices, unified_etherscan_api_call, _session, _json_dumps, _json_loads
+
+# Cache transaction lookups by hash - confirmed transactions are immutable so
+# they can be kept for a long time, pending ones only briefly
+_tx_cache = OrderedDict()
+_TX_CACHE_MAX_SIZE = 2048
+_TX_CACHE_TTL_CONFIRMED = 3600  # seconds
+_TX_CACHE_TTL_PENDING = 5  # seconds
+
+def _tx_cache_get(key: str) -> Optional[Any]:
+    """Return a cached transaction lookup if it hasn't expired"""
+    cached = _tx_cache.get(key)
+    if cached:
+        expires_at, value = cached
+        if time.time() < expires_at:
+            return value
+        del _tx_cache[key]
+    return None
+
+def _tx_cache_put(key: str, value: Any, confirmed: bool):
+    """Cache a transaction lookup, evicting the oldest entry when full"""
+    ttl = _TX_CACHE_TTL_CONFIRMED if confirmed else _TX_CACHE_TTL_PENDING
+    _tx_cache[key] = (time.time() + ttl, value)
+    while len(_tx_cache) > _TX_CACHE_MAX_SIZE:
+        _tx_cache.popitem(last=False)
+
+# Block timestamps are immutable once mined, so they're memoized forever
+# (bounded only to cap memory) keyed by (chainid, block_number)
+_block_ts_cache = OrderedDict()
+_BLOCK_TS_CACHE_MAX_SIZE = 4096
+
+# Swap event topic0 (keccak of the event signature), precomputed for raw
+# eth_getLogs filtering
+SWAP_EVENT_TOPIC = "0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67"
+
+# Pool contract instances cached per token - to_checksum_address keccaks the
+# address and eth.contract rebuilds the ABI codec, so build each one once
+_pool_contracts = {}
+
+def get_pool_contract(token_key: str, w3: Web3):
+    """Return the pool contract for a token, building it on first use"""
+    contract = _pool_contracts.get(token_key)
+    if contract is None:
+        token_config = get_token_config(token_key)
+        if not token_config:
+            return None
+        contract = w3.eth.contract(
+            address=Web3.to_checksum_address(token_config["pool_address"]),
+            abi=UNISWAP_POOL_ABI
+        )
+        _pool_contracts[token_key] = contract
+    return contract
+
+# A pool's token0/token1 assignment is fixed at deployment, so the order
+# lookup (two eth_calls) only ever needs to run once per pool
+_token_order_cache = {}
+
+# Processed tx hashes are mirrored to a small SQLite file so a restart
+# doesn't re-post swaps the previous process already announced
+SEEN_DB_FILE = "seen_transactions.db"
+_SEEN_RETENTION = 86400  # only the last 24h of hashes are reloaded
+
+_seen_db = sqlite3.connect(SEEN_DB_FILE, isolation_level=None, check_same_thread=False)
+_seen_db.execute("PRAGMA journal_mode=WAL")
+_seen_db.execute(
+    "CREATE TABLE IF NOT EXISTS seen ("
+    "token_key TEXT, tx_hash TEXT, ts INTEGER, "
+    "PRIMARY KEY (token_key, tx_hash))"
+)
+_seen_db.execute("DELETE FROM seen WHERE ts <= ?", (int(time.time()) - _SEEN_RETENTION,))
+
+class _LRUSet:
+    """Set with a capacity cap - the oldest entries are evicted first
 
-# Track processed transactions to avoid duplicates (per token)
+    Keeps the memory of long-running monitoring bounded: a plain set of tx
+    hashes grows forever, while duplicates only ever arrive within a short
+    window of each other. When a name is given, entries are written through
+    to the seen-transactions database and the last 24h are reloaded at
+    startup.
+    """
+
+    def __init__(self, cap: int, name: str = None):
+        self._d = OrderedDict()
+        self.cap = cap
+        self.name = name
+        if name:
+            try:
+                cutoff = int(time.time()) - _SEEN_RETENTION
+                rows = _seen_db.execute(
+                    "SELECT tx_hash FROM seen WHERE token_key = ? AND ts > ? ORDER BY ts",
+                    (name, cutoff)
+                )
+                for (tx_hash,) in rows:
+                    self._d[tx_hash] = None
+            except Exception as e:
+                print(f"⚠️ Could not load seen transactions for {name}: {e}")
+
+    def add(self, item):
+        self._d[item] = None
+        self._d.move_to_end(item)
+        if len(self._d) > self.cap:
+            self._d.popitem(last=False)
+        if self.name:
+            try:
+                _seen_db.execute(
+                    "INSERT OR IGNORE INTO seen VALUES (?, ?, ?)",
+                    (self.name, item, int(time.time()))
+                )
+            except Exception as e:
+                print(f"⚠️ Could not persist seen transaction: {e}")
+
+    def __contains__(self, item):
+        return item in self._d
+
+    def __len__(self):
+        return len(self._d)
+
+# Track processed transactions to avoid duplicates (per token, bounded,
+# persisted across restarts)
 processed_transactions = {
-    "emp": set(),
-    "talos": set()
+    "emp": _LRUSet(10000, "emp"),
+    "talos": _LRUSet(10000, "talos")
+}
+
+def hex_to_signed_int(hex_str: str) -> int:
+    """Convert a 32-byte hex string to a signed integer (two's complement)"""
+    value = int(hex_str, 16)
+    # Check if negative (two's complement)
+    if value > 2**255 - 1:
+        value = value - 2**256
+    return value
+
+def hex_to_unsigned_int(hex_str: str) -> int:
+    """Convert a hex string to an unsigned integer"""
+    return int(hex_str, 16)
+
+# Raw on-chain amounts are 18-decimal fixed point; divide by this once per
+# value instead of re-evaluating 10 ** 18 inside the hot loops
+_WAD = 10 ** 18
+
+# Timestamp display format, parsed by strftime once per call instead of
+# being re-created as a literal in every branch
+_TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Emoji pairs used in trade messages - built with a single C-level string
+# multiply + slice instead of a Python loop of concatenations
+_BUY_EMOJI_PATTERN = "🍑🍒"
+_SELL_EMOJI_PATTERN = "🍆🍌"
+
+def build_action_emojis(pattern: str, usd_value: float) -> str:
+    """Build the emoji bar for a trade - one emoji per $50, capped at 100"""
+    count = max(1, math.ceil(usd_value / 50)) if usd_value > 0 else 1
+    count = min(count, 100)
+    return (pattern * ((count + 1) // 2))[:count]
+
+# Direction label and emoji pattern per trade side - the sell and buy
+# message formats are identical apart from these two pieces
+_TRADE_STYLES = {
+    "sell": ("🔴 SOLD", _SELL_EMOJI_PATTERN),
+    "buy": ("🟢 BOUGHT", _BUY_EMOJI_PATTERN)
 }
 
+# Message templates built once at import - the hot paths just fill in the
+# fields instead of assembling multi-line f-strings on every trade
+_TRADE_DETAIL_TMPL = (
+    "{direction}\n\n"
+    "{action_emojis}\n\n"
+    "💰 ${usd_value:.2f} ({eth_amount:.2f} ETH)\n"
+    "💎 {token_amount:.3f} ${token_symbol}\n"
+    "💵 ${actual_price_per_token:.2f} per {token_symbol}\n"
+    "⏰ {timestamp}\n"
+    "🔗 [View TX]({explorer_url}/tx/{tx_hash})\n"
+)
+
+_TRADE_DETAIL_NO_USD_TMPL = (
+    "{direction}\n\n"
+    "{action_emojis}\n\n"
+    "💰 {eth_amount:.2f} ETH\n"
+    "💎 {token_amount:.3f} ${token_symbol}\n"
+    "⏰ {timestamp}\n"
+    "🔗 [View TX]({explorer_url}/tx/{tx_hash})\n"
+)
+
+_SWAP_MESSAGE_TMPL = (
+    "{title}\n\n"
+    "{action_emojis}\n\n"
+    "💰 **${total_usd:,.2f}** ({eth_amount:.3f} ETH)\n"
+    "💎 **{tracked_token_amount:,.3f} ${token_symbol}**\n"
+    "💵 **${price_per_token:,.4f} per ${token_symbol}**\n\n"
+    "🔗 **Transaction:** [View TX]({explorer_url}/tx/{tx_hash})"
+)
+
+def _format_trade_detail(side: str, token_amount: float, eth_amount: float,
+                         token_usd_price: float, eth_usd_price: float,
+                         token_symbol: str, explorer_url: str, tx_hash: str,
+                         timestamp: datetime) -> Tuple[str, float]:
+    """
+    Format one buy/sell entry for the last-5 list
+
+    Returns:
+        Tuple of (formatted detail, usd value of the trade)
+    """
+    label, pattern = _TRADE_STYLES[side]
+    direction = f"{label} ${token_symbol}"
+    usd_value = eth_amount * eth_usd_price
+
+    # Calculate actual price per token from the transaction
+    if token_amount > 0 and eth_usd_price > 0:
+        actual_price_per_token = usd_value / token_amount
+    else:
+        actual_price_per_token = token_usd_price  # Fallback to current price
+
+    action_emojis = build_action_emojis(pattern, usd_value)
+
+    # Format detail based on whether we have USD prices
+    tmpl = _TRADE_DETAIL_TMPL if eth_usd_price > 0 else _TRADE_DETAIL_NO_USD_TMPL
+    detail = tmpl.format(
+        direction=direction,
+        action_emojis=action_emojis,
+        usd_value=usd_value,
+        eth_amount=eth_amount,
+        token_amount=token_amount,
+        token_symbol=token_symbol,
+        actual_price_per_token=actual_price_per_token,
+        timestamp=timestamp.strftime(_TS_FORMAT),
+        explorer_url=explorer_url,
+        tx_hash=tx_hash
+    )
+
+    return detail, usd_value
+
+def short_address(addr: str) -> str:
+    """Shorten an address for display, e.g. 0xe09276...339BF80"""
+    if not addr:
+        return ""
+    return addr[:8] + "..." + addr[-6:]
+
 def decode_swap_event_data(data: str, topics: List[str]) -> Optional[Dict]:
     """
     Decode raw log data for Swap events
@@ -71,17 +305,6 @@ def decode_swap_event_data(data: str, topics: List[str]) -> Optional[Dict]:
         liquidity_hex = data[192:256]
         tick_hex = data[256:320]
         
-        # Convert hex to integers (handle signed integers for amount0, amount1, tick)
-        def hex_to_signed_int(hex_str: str) -> int:
-            value = int(hex_str, 16)
-            # Check if negative (two's complement)
-            if value > 2**255 - 1:
-                value = value - 2**256
-            return value
-            
-        def hex_to_unsigned_int(hex_str: str) -> int:
-            return int(hex_str, 16)
-        
         decoded = {
             "amount0": hex_to_signed_int(amount0_hex),
             "amount1": hex_to_signed_int(amount1_hex),
@@ -107,26 +330,112 @@ def get_transaction_details(tx_hash: str, token_key: str = "emp") -> Optional[di
         return None
     
     chainid = token_config.get("chainid", 1)  # Default to Ethereum if not specified
-    
-    return unified_etherscan_api_call(
+
+    cache_key = f"{chainid}:{tx_hash}"
+    cached = _tx_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = unified_etherscan_api_call(
         module="proxy",
         action="eth_getTransactionByHash",
         chainid=chainid,
         txhash=tx_hash
     )
 
+    if result is not None:
+        confirmed = isinstance(result, dict) and result.get("blockNumber") is not None
+        _tx_cache_put(cache_key, result, confirmed)
+
+    return result
+
+def get_block_timestamps(block_numbers: List[int], token_key: str = "emp") -> Dict[int, int]:
+    """
+    Fetch timestamps for several blocks in one batched JSON-RPC request
+
+    Uses JSON-RPC 2.0 array batching, so N block lookups cost a single
+    round-trip instead of N sequential calls.
+
+    Returns:
+        Dict mapping block number to unix timestamp (missing on failure)
+    """
+    token_config = get_token_config(token_key)
+    if not token_config or not block_numbers:
+        return {}
+
+    chainid = token_config.get("chainid", 1)
+
+    # Block timestamps are immutable, so cached entries never go stale -
+    # only blocks we haven't seen before need a network round-trip
+    timestamps = {}
+    missing = []
+    for bn in block_numbers:
+        cached = _block_ts_cache.get((chainid, bn))
+        if cached is not None:
+            timestamps[bn] = cached
+        else:
+            missing.append(bn)
+
+    if not missing:
+        return timestamps
+
+    rpc_url = token_config.get("rpc_url")
+    if not rpc_url:
+        return timestamps
+
+    payload = [
+        {"jsonrpc": "2.0", "method": "eth_getBlockByNumber", "params": [hex(bn), False], "id": bn}
+        for bn in missing
+    ]
+
+    try:
+        response = _session.post(
+            rpc_url,
+            data=_json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=10
+        )
+        if response.status_code != 200:
+            print(f"RPC HTTP Error fetching block timestamps: {response.status_code}")
+            return timestamps
+
+        for item in _json_loads(response.content):
+            result = item.get("result")
+            if result and result.get("timestamp"):
+                bn = item.get("id")
+                ts = hex_to_unsigned_int(result["timestamp"])
+                timestamps[bn] = ts
+                _block_ts_cache[(chainid, bn)] = ts
+        while len(_block_ts_cache) > _BLOCK_TS_CACHE_MAX_SIZE:
+            _block_ts_cache.popitem(last=False)
+        return timestamps
+
+    except Exception as e:
+        print(f"Error fetching block timestamps: {e}")
+        return timestamps
+
 def get_token_order(pool_address: str, token_address: str, network: str, w3: Web3) -> Optional[str]:
     """
     Determine which token is token0 and which is token1 in the pool
     Returns: 'token0' if the tracked token is token0, 'token1' if it's token1
+
+    Token order is immutable once a pool is deployed, so the result is
+    memoized per (pool, token) - this runs once per pool instead of two
+    eth_calls on every swap event.
     """
+    cache_key = (pool_address.lower(), token_address.lower())
+    cached = _token_order_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        # Create pool contract instance
+        # Build the contract by raw pool address (get_pool_contract is keyed
+        # by token_key, which this helper doesn't receive)
         pool_contract = w3.eth.contract(
             address=Web3.to_checksum_address(pool_address),
             abi=UNISWAP_POOL_ABI
         )
-        
+
         # Get token0 and token1 addresses
         token0_address = pool_contract.functions.token0().call()
         token1_address = pool_contract.functions.token1().call()
@@ -139,9 +448,11 @@ def get_token_order(pool_address: str, token_address: str, network: str, w3: Web
         # Compare addresses (case-insensitive)
         if token0_address.lower() == token_address.lower():
             print(f"✅ Tracked token is Token0")
+            _token_order_cache[cache_key] = 'token0'
             return 'token0'
         elif token1_address.lower() == token_address.lower():
             print(f"✅ Tracked token is Token1")
+            _token_order_cache[cache_key] = 'token1'
             return 'token1'
         else:
             print(f"❌ Tracked token not found in pool!")
@@ -163,12 +474,9 @@ def get_last_5_transactions(token_key: str = "emp", w3: Web3 = None) -> Optional
         return None
     
     try:
-        # Create contract instance
-        pool_contract = w3.eth.contract(
-            address=Web3.to_checksum_address(token_config["pool_address"]),
-            abi=UNISWAP_POOL_ABI
-        )
-        
+        # Reuse the cached contract instance
+        pool_contract = get_pool_contract(token_key, w3)
+
         # Get latest block with rate limiting
         try:
             latest_block = w3.eth.block_number
@@ -180,39 +488,50 @@ def get_last_5_transactions(token_key: str = "emp", w3: Web3 = None) -> Optional
                 print(f"Error getting block number in get_last_5_transactions for {token_key}: {e}")
                 return None
         
-        # Search for recent events (go back more blocks to ensure we get enough)
-        search_blocks = 5000  # Search last 5000 blocks
-        from_block = latest_block - search_blocks
-        
-        # Get swap events with rate limiting
-        try:
-            swap_events = pool_contract.events.Swap.get_logs(
-                fromBlock=from_block,
-                toBlock=latest_block
-            )
-        except Exception as e:
-            if "429" in str(e) or "Too Many Requests" in str(e):
-                print(f"Rate limited while getting swap events for {token_key}")
-                return None
-            else:
-                print(f"Error getting swap events for {token_key}: {e}")
-                return None
-        
-        # Sort by block number (newest first)
-        sorted_events = sorted(swap_events, key=lambda x: x['blockNumber'], reverse=True)
-        
-        # Filter for buy/sell transactions only
+        # Scan backwards in growing windows instead of always pulling 5000
+        # blocks of logs - on an active pool the 5 most recent trades sit in
+        # the newest few hundred blocks, so the first small query usually
+        # suffices and the response stays well under the node's log caps
+        max_search_blocks = 5000
+        window = 500
+        oldest_block = latest_block - max_search_blocks + 1
+        to_block = latest_block
         buy_sell_events = []
-        for event in sorted_events:
-            amount0 = event["args"]["amount0"]
-            amount1 = event["args"]["amount1"]
-            
-            # Check if it's a buy (ETH -> Token) or sell (Token -> ETH)
-            if (amount0 < 0 and amount1 > 0) or (amount0 > 0 and amount1 < 0):
-                buy_sell_events.append(event)
-                if len(buy_sell_events) >= 5:  # Stop after finding 5
-                    break
-        
+
+        while to_block >= oldest_block and len(buy_sell_events) < 5:
+            from_block = max(to_block - window + 1, oldest_block)
+
+            # Get swap events with rate limiting
+            try:
+                swap_events = pool_contract.events.Swap.get_logs(
+                    fromBlock=from_block,
+                    toBlock=to_block
+                )
+            except Exception as e:
+                if "429" in str(e) or "Too Many Requests" in str(e):
+                    print(f"Rate limited while getting swap events for {token_key}")
+                    return None
+                else:
+                    print(f"Error getting swap events for {token_key}: {e}")
+                    return None
+
+            # get_logs returns entries ordered by (blockNumber, logIndex),
+            # so walking the window in reverse yields newest-first without
+            # paying for a sort
+            for event in reversed(swap_events):
+                amount0 = event["args"]["amount0"]
+                amount1 = event["args"]["amount1"]
+
+                # Check if it's a buy (ETH -> Token) or sell (Token -> ETH)
+                if (amount0 < 0 and amount1 > 0) or (amount0 > 0 and amount1 < 0):
+                    buy_sell_events.append(event)
+                    if len(buy_sell_events) >= 5:  # Stop after finding 5
+                        break
+
+            # Widen the window for the next (older) slice of history
+            to_block = from_block - 1
+            window *= 2
+
         return buy_sell_events[:5]
         
     except Exception as e:
@@ -274,10 +593,12 @@ def process_swap_event(event: Dict, tx_hash: str, token_key: str, w3: Web3) -> T
         network = token_config["network"]
         
         # Get swap event data - handle different event structures
-        if "args" in event and "amount0" in event["args"] and "amount1" in event["args"]:
+        args = event.get("args")
+        if args and "amount0" in args and "amount1" in args:
             # Standard Uniswap V3 Swap event structure
-            amount0_raw = event["args"]["amount0"]
-            amount1_raw = event["args"]["amount1"]
+            amount0_raw = args["amount0"]
+            amount1_raw = args["amount1"]
+            sqrt_price_x96 = args.get("sqrtPriceX96")
         elif "data" in event and "topics" in event:
             # Raw log event - try to decode it
             print(f"[{token_key.upper()}] 🔍 Attempting to decode raw log data...")
@@ -286,6 +607,7 @@ def process_swap_event(event: Dict, tx_hash: str, token_key: str, w3: Web3) -> T
             if decoded_data and "amount0" in decoded_data and "amount1" in decoded_data:
                 amount0_raw = decoded_data["amount0"]
                 amount1_raw = decoded_data["amount1"]
+                sqrt_price_x96 = decoded_data.get("sqrtPriceX96")
                 print(f"[{token_key.upper()}] ✅ Successfully decoded raw log data")
             else:
                 print(f"[{token_key.upper()}] ❌ Failed to decode raw log data - this might be a non-Swap event (Mint/Burn/Flash)")
@@ -314,8 +636,8 @@ def process_swap_event(event: Dict, tx_hash: str, token_key: str, w3: Web3) -> T
             eth_amount_raw = amount0_raw
             
         # Convert raw amounts to human-readable format (assuming 18 decimals for both)
-        tracked_token_amount = abs(tracked_token_amount_raw) / (10 ** 18)
-        eth_amount = abs(eth_amount_raw) / (10 ** 18)
+        tracked_token_amount = abs(tracked_token_amount_raw) / _WAD
+        eth_amount = abs(eth_amount_raw) / _WAD
 
         # Determine direction (BUY or SELL)
         if tracked_token_amount_raw < 0:
@@ -331,47 +653,41 @@ def process_swap_event(event: Dict, tx_hash: str, token_key: str, w3: Web3) -> T
         token_usd_price, eth_usd_price = get_cached_prices("T" if token_symbol == "T" else "EMP")
         total_usd = eth_amount * eth_usd_price
         
-        # Calculate the price per token from this specific transaction
-        if tracked_token_amount > 0 and total_usd > 0:
+        # Calculate the price per token from this specific transaction.
+        # The Swap log carries the pool's post-swap sqrtPriceX96 - the exact
+        # execution price - so prefer it over dividing USD totals, which
+        # inherits rounding from the amounts (both tokens are 18 decimals,
+        # so no decimal adjustment is needed)
+        if sqrt_price_x96:
+            eth_per_token = (sqrt_price_x96 ** 2) / (2 ** 192)  # token1 per token0
+            if token_order == 'token1':
+                eth_per_token = 1 / eth_per_token if eth_per_token else 0
+            price_per_token = eth_per_token * eth_usd_price
+        elif tracked_token_amount > 0 and total_usd > 0:
             price_per_token = total_usd / tracked_token_amount
         else:
             price_per_token = 0  # Fallback
 
-        # Build the message
-        emoji_count = max(1, int(total_usd / 50)) if total_usd > 0 else 1
-        action_emojis = ""
-
+        # Build the message from the shared template
         if direction == "🟢 BUY":
             title = f"🟢 **BOUGHT ${token_symbol}** 🟢"
-            # Build buy emojis (🍑🍒)
-            for i in range(emoji_count):
-                action_emojis += "🍑" if i % 2 == 0 else "🍒"
-            
-            details = (
-                f"💰 **${total_usd:,.2f}** ({eth_amount:.3f} ETH)\n"
-                f"💎 **{tracked_token_amount:,.3f} ${token_symbol}**\n"
-            )
-
+            action_emojis = build_action_emojis(_BUY_EMOJI_PATTERN, total_usd)
         elif direction == "🔴 SELL":
             title = f"🔴 **SOLD ${token_symbol}** 🔴"
-            # Build sell emojis (🍆🍌)
-            for i in range(emoji_count):
-                action_emojis += "🍆" if i % 2 == 0 else "🍌"
-
-            details = (
-                f"💰 **${total_usd:,.2f}** ({eth_amount:.3f} ETH)\n"
-                f"💎 **{tracked_token_amount:,.3f} ${token_symbol}**\n"
-            )
+            action_emojis = build_action_emojis(_SELL_EMOJI_PATTERN, total_usd)
         else:  # SWAP or UNKNOWN
             return f"🔄 **Swap Detected**\n\n🔗 [{tx_hash[:10]}...]({explorer_url}/tx/{tx_hash})", "SWAP"
 
-        # Assemble the final message
-        message = (
-            f"{title}\n\n"
-            f"{action_emojis}\n\n"
-            f"{details}"
-            f"💵 **${price_per_token:,.4f} per ${token_symbol}**\n\n"
-            f"🔗 **Transaction:** [View TX]({explorer_url}/tx/{tx_hash})"
+        message = _SWAP_MESSAGE_TMPL.format(
+            title=title,
+            action_emojis=action_emojis,
+            total_usd=total_usd,
+            eth_amount=eth_amount,
+            tracked_token_amount=tracked_token_amount,
+            token_symbol=token_symbol,
+            price_per_token=price_per_token,
+            explorer_url=explorer_url,
+            tx_hash=tx_hash
         )
         
         return message, direction, price_per_token
@@ -403,122 +719,69 @@ def format_last_5_transactions(transactions: List[Dict], token_key: str = "emp",
         # For EMP, get both prices
         token_usd_price, eth_usd_price = get_cached_prices()
     
+    # Fetch every block timestamp in one batched RPC call up front instead
+    # of one get_block round-trip per transaction inside the loop
+    block_timestamps = get_block_timestamps(
+        sorted({event["blockNumber"] for event in transactions}),
+        token_key
+    )
+
     # Process each transaction
     transaction_details = []
     total_bought = 0
     total_sold = 0
     buy_count = 0
     sell_count = 0
-    
+
     for event in transactions:
         try:
-            # Extract data
-            sender = event["args"]["sender"]
-            amount0 = event["args"]["amount0"]
-            amount1 = event["args"]["amount1"]
+            # Extract data - bind everything once up front so the rest of
+            # the loop body is plain local reads
+            args = event["args"]
+            sender = args["sender"]
+            amount0 = args["amount0"]
+            amount1 = args["amount1"]
             tx_hash = event["transactionHash"].hex()
             block_number = event["blockNumber"]
             
-            # Get block timestamp
-            try:
-                block = w3.eth.get_block(block_number)
-                timestamp = datetime.fromtimestamp(block.timestamp)
-            except:
-                timestamp = datetime.now()
+            # Get block timestamp - prefer the batched lookup, fall back to a
+            # single get_block call if the batch failed for this block
+            ts = block_timestamps.get(block_number)
+            if ts is not None:
+                timestamp = datetime.fromtimestamp(ts)
+            else:
+                try:
+                    block = w3.eth.get_block(block_number)
+                    timestamp = datetime.fromtimestamp(block.timestamp)
+                except Exception as e:
+                    print(f"⚠️ Could not fetch block {block_number} timestamp: {e}")
+                    timestamp = datetime.now()
             
             # Convert amounts
-            token_amount = abs(amount0) / (10 ** 18)
-            eth_amount = abs(amount1) / (10 ** 18)
+            token_amount = abs(amount0) / _WAD
+            eth_amount = abs(amount1) / _WAD
             
             # Determine direction
             if amount0 > 0 and amount1 < 0:
-                # SELL Token
-                direction = f"🔴 SOLD ${token_symbol}"
-                action_emojis = ""
-                usd_value = eth_amount * eth_usd_price  # Use ETH amount for USD value
-                print(f"Last5 SELL - eth_amount: {eth_amount}, eth_usd_price: ${eth_usd_price}, usd_value: ${usd_value}")
-                
-                # Calculate actual price per token from the transaction
-                if token_amount > 0 and eth_usd_price > 0:
-                    actual_price_per_token = usd_value / token_amount
-                else:
-                    actual_price_per_token = token_usd_price  # Fallback to current price
-                
-                emoji_count = max(1, int(usd_value / 50) + (1 if usd_value % 50 > 0 else 0)) if usd_value > 0 else 1
-                for i in range(emoji_count):
-                    if i % 2 == 0:
-                        action_emojis += "🍆"
-                    else:
-                        action_emojis += "🍌"
-                
+                side = "sell"
+            elif amount0 < 0 and amount1 > 0:
+                side = "buy"
+            else:
+                continue  # Not a buy/sell swap
+
+            detail, usd_value = _format_trade_detail(
+                side, token_amount, eth_amount, token_usd_price, eth_usd_price,
+                token_symbol, explorer_url, tx_hash, timestamp
+            )
+            print(f"Last5 {side.upper()} - eth_amount: {eth_amount}, eth_usd_price: ${eth_usd_price}, usd_value: ${usd_value}")
+
+            if side == "sell":
                 total_sold += usd_value
                 sell_count += 1
-                
-                # Format detail based on whether we have USD prices
-                if eth_usd_price > 0:
-                    detail = (
-                        f"{direction}\n\n"
-                        f"{action_emojis}\n\n"
-                        f"💰 ${usd_value:.2f} ({eth_amount:.2f} ETH)\n"
-                        f"💎 {token_amount:.3f} ${token_symbol}\n"
-                        f"💵 ${actual_price_per_token:.2f} per {token_symbol}\n"
-                        f"⏰ {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                        f"🔗 [View TX]({explorer_url}/tx/{tx_hash})\n"
-                    )
-                else:
-                    detail = (
-                        f"{direction}\n\n"
-                        f"{action_emojis}\n\n"
-                        f"💰 {eth_amount:.2f} ETH\n"
-                        f"💎 {token_amount:.3f} ${token_symbol}\n"
-                        f"⏰ {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                        f"🔗 [View TX]({explorer_url}/tx/{tx_hash})\n"
-                    )
-                
-            elif amount0 < 0 and amount1 > 0:
-                # BUY Token
-                direction = f"🟢 BOUGHT ${token_symbol}"
-                action_emojis = ""
-                usd_value = eth_amount * eth_usd_price
-                print(f"Last5 BUY - eth_amount: {eth_amount}, eth_usd_price: ${eth_usd_price}, usd_value: ${usd_value}")
-                
-                # Calculate actual price per token from the transaction
-                if token_amount > 0 and eth_usd_price > 0:
-                    actual_price_per_token = usd_value / token_amount
-                else:
-                    actual_price_per_token = token_usd_price  # Fallback to current price
-                
-                emoji_count = max(1, int(usd_value / 50) + (1 if usd_value % 50 > 0 else 0)) if usd_value > 0 else 1
-                for i in range(emoji_count):
-                    if i % 2 == 0:
-                        action_emojis += "🍑"
-                    else:
-                        action_emojis += "🍒"
-                
+            else:
                 total_bought += usd_value
                 buy_count += 1
-                
-                # Format detail based on whether we have USD prices
-                if eth_usd_price > 0:
-                    detail = (
-                        f"{direction}\n\n"
-                        f"{action_emojis}\n\n"
-                        f"💰 ${usd_value:.2f} ({eth_amount:.2f} ETH)\n"
-                        f"💎 {token_amount:.3f} ${token_symbol}\n"
-                        f"💵 ${actual_price_per_token:.2f} per {token_symbol}\n"
-                        f"⏰ {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                        f"🔗 [View TX]({explorer_url}/tx/{tx_hash})\n"
-                    )
-                else:
-                    detail = (
-                        f"{direction}\n\n"
-                        f"{action_emojis}\n\n"
-                        f"💰 {eth_amount:.2f} ETH\n"
-                        f"💎 {token_amount:.3f} ${token_symbol}\n"
-                        f"⏰ {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                        f"🔗 [View TX]({explorer_url}/tx/{tx_hash})\n"
-                    )
-            
+
             transaction_details.append(detail)
             
         except Exception as e:
@@ -542,11 +805,11 @@ def format_last_5_transactions(transactions: List[Dict], token_key: str = "emp",
         f"📊 **${total_volume:,.0f} Total Volume**\n"
     )
     
-    # Combine all details with numbered transactions
-    numbered_details = []
-    for i, detail in enumerate(transaction_details, 1):
-        numbered_details.append(f"**Transaction {i}:**\n{detail}")
-    
-    full_message = "\n\n----------------------\n\n".join(numbered_details) + "\n\n----------------------\n\n" + summary
-    
-    return full_message 
\ No newline at end of file
+    # Combine all details with numbered transactions - one join builds the
+    # whole message without intermediate concatenations
+    numbered_details = [
+        f"**Transaction {i}:**\n{detail}"
+        for i, detail in enumerate(transaction_details, 1)
+    ]
+
+    return "\n\n----------------------\n\n".join(numbered_details + [summary]) 
\ No newline at end of file